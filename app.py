@@ -1,47 +1,615 @@
 # Import libraries
 
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import dash
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
-from dash import dcc, html
-from dash.dependencies import Input, Output, State
+from dash import dcc, html, Patch
+from dash.dependencies import Input, Output, State, ClientsideFunction
 import zipfile
+import gzip
+import os
+import sys
+import glob
+import time
+import bisect
+import cProfile
+import pstats
+import threading
+import json
+import shutil
+import hmac
+import functools
+from collections import OrderedDict
+from dash.exceptions import PreventUpdate
+import flask
 
 
 # Import data
 
-whole_data_set_zip = 'whole_data_set.zip'
+whole_data_set_zip = os.environ.get('WHOLE_DATA_SET_ZIP', 'whole_data_set.zip')
 introduction_glossary_zip = 'introduction_glossary.zip'
 
+dataset_cache_dir = os.environ.get('DATASET_CACHE_DIR', '.dataset_cache')
+dataset_cache_version = 4
+dataset_cache_fingerprints = int(os.environ.get('DATASET_CACHE_FINGERPRINTS', 2))
+
+# Columns read by the dashboard (the cache keeps every column, startup only loads these)
+
+whole_data_set_columns = [
+    'composer', 'composition', 'movement', 'id', 'instrument_name', 'ensemble',
+    'key_center', 'key_quality', 'note_name', 'note_interval', 'note_status', 'melodic_index',
+    'note_is_harmonic', 'restored_indexed_note_is_melodic', 'decade', 'composition_year',
+]
+
+# Compact encoding: dimensions as categoricals (note_name & note_interval become int8 codes
+# with their categories as the decode table), flags as bools and indexes as int32
+# (no object columns are left, so every column can be memory-mapped by the shared dataset)
+
+whole_data_set_dtypes = {
+    'composer': 'category',
+    'composition': 'category',
+    'movement': 'category',
+    'instrument_name': 'category',
+    'ensemble': 'category',
+    'key_center': 'category',
+    'key_quality': 'category',
+    'note_name': 'category',
+    'note_interval': 'category',
+    'note_status': 'category',
+    'decade': 'category',
+    'id': 'int32',
+    'melodic_index': 'int32',
+    'note_is_harmonic': 'bool',
+    'restored_indexed_note_is_melodic': 'bool',
+}
+
 # Read csv from zip
 
-def read_csv_from_zip(zip_filename, csv_filename):
+def read_csv_from_zip(zip_filename, csv_filename, dtype=None):
     with zipfile.ZipFile(zip_filename, 'r') as zip_file:
         with zip_file.open(csv_filename) as csv_file:
-            return pd.read_csv(csv_file)
-        
-whole_data_set = read_csv_from_zip(whole_data_set_zip, 'whole_data_set.csv')
+            return pd.read_csv(csv_file, dtype=dtype)
+
+# Fingerprint the csv inside the zip using the CRC and size stored in the zip directory,
+# so the cache is invalidated whenever the source data changes without reading the archive
+
+def get_zip_fingerprint(zip_filename, csv_filename):
+    with zipfile.ZipFile(zip_filename, 'r') as zip_file:
+        csv_info = zip_file.getinfo(csv_filename)
+    return f'{csv_info.CRC:08x}{csv_info.file_size:x}'
+
+# Remove the stale caches of a cache file or directory named <name>-<fingerprint>-v<version><extension> once it is
+# written: every other version of the same name, and its caches of all but the newest DATASET_CACHE_FINGERPRINTS
+# fingerprints (its own included, most recently written first), so the directory does not grow each time the zip
+# changes and switching back to the previous zip or between two corpora does not rebuild
+# Another process starting at the same time may remove the same files first
+
+def get_modified_time(path):
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return 0.0
+
+def remove_stale_caches(current_path):
+    fingerprinted_name, current_version = current_path.rsplit('-v', 1)
+    name = fingerprinted_name.rsplit('-', 1)[0]
+    extension = os.path.splitext(current_path)[1]
+
+    stale_paths = []
+    other_fingerprint_paths = []
+    for cache_path in glob.glob(f'{glob.escape(name)}-*-v*{extension}'):
+        cache_fingerprinted_name, version = cache_path.rsplit('-v', 1)
+        if cache_fingerprinted_name.rsplit('-', 1)[0] != name or cache_path == current_path:
+            continue
+        if version != current_version:
+            stale_paths.append(cache_path)
+        else:
+            other_fingerprint_paths.append(cache_path)
+
+    other_fingerprint_paths.sort(key=get_modified_time, reverse=True)
+    stale_paths.extend(other_fingerprint_paths[max(dataset_cache_fingerprints - 1, 0):])
+
+    for stale_path in stale_paths:
+        if os.path.isdir(stale_path):
+            shutil.rmtree(stale_path, ignore_errors=True)
+        else:
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
+
+# Read csv from the columnar cache, building the cache from the zip on first load
+
+def read_csv_from_cache(zip_filename, csv_filename, columns, dtype=None, prepare=None):
+    cache_name = os.path.splitext(csv_filename)[0]
+    fingerprint = get_zip_fingerprint(zip_filename, csv_filename)
+    cache_path = os.path.join(dataset_cache_dir, f'{cache_name}-{fingerprint}-v{dataset_cache_version}.parquet')
+
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path, columns=columns)
+
+    data = read_csv_from_zip(zip_filename, csv_filename, dtype=dtype)
+    if prepare is not None:
+        data = prepare(data)
+
+    try:
+        os.makedirs(dataset_cache_dir, exist_ok=True)
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+        data.to_parquet(temp_path, index=False)
+        os.replace(temp_path, cache_path)
+    except (ImportError, OSError):
+        # No parquet engine or read-only disk: serve from the csv without caching
+        return data[columns]
+
+    remove_stale_caches(cache_path)
+
+    return data[columns]
+
+# Store notes partitioned by movement: sorted by movement id, then melodic index (original order kept within a note)
+
+def sort_by_movement(data):
+    return data.sort_values(['id', 'melodic_index'], kind='stable').reset_index(drop=True)
+
+# Shared dataset (SHARED_DATASET=1): the prepared note table and its filter index row ids are written once as
+# .npy files and memory-mapped read-only by every worker process, so the OS page cache holds a single copy
+
+shared_dataset_enabled = os.environ.get('SHARED_DATASET', '0') == '1'
+
+def get_shared_dataset_path(zip_filename, csv_filename):
+    cache_name = os.path.splitext(csv_filename)[0]
+    fingerprint = get_zip_fingerprint(zip_filename, csv_filename)
+    return os.path.join(dataset_cache_dir, f'{cache_name}-{fingerprint}-v{dataset_cache_version}.shared')
+
+# Write the columns (categoricals as their codes, categories kept in layout.json) and the filter index
+# (each column's row ids in value order plus the number of rows of each value) into a new directory
+
+def write_shared_dataset(shared_dataset_path, data, filter_index):
+    layout = {'columns': {}, 'filter_index': {}}
+    temp_path = f'{shared_dataset_path}.{os.getpid()}.tmp'
+    os.makedirs(temp_path, exist_ok=True)
+
+    for column in data.columns:
+        if isinstance(data[column].dtype, pd.CategoricalDtype):
+            np.save(os.path.join(temp_path, f'{column}.npy'), data[column].array.codes)
+            layout['columns'][column] = data[column].cat.categories.tolist()
+        else:
+            np.save(os.path.join(temp_path, f'{column}.npy'), data[column].to_numpy())
+            layout['columns'][column] = None
+
+    for column, rows_by_value in filter_index.items():
+        np.save(os.path.join(temp_path, f'filter_index-{column}.npy'), np.concatenate(list(rows_by_value.values())))
+        layout['filter_index'][column] = [len(rows) for rows in rows_by_value.values()]
+
+    with open(os.path.join(temp_path, 'layout.json'), 'w') as layout_file:
+        json.dump(layout, layout_file)
+
+    try:
+        os.rename(temp_path, shared_dataset_path)
+    except OSError:
+        # Another worker wrote it first, map theirs
+        shutil.rmtree(temp_path, ignore_errors=True)
+        return
+
+    remove_stale_caches(shared_dataset_path)
+
+# Map the shared dataset read-only, returns (data, filter_index) or None when it has not been written yet
+
+def read_shared_dataset(shared_dataset_path):
+    try:
+        with open(os.path.join(shared_dataset_path, 'layout.json')) as layout_file:
+            layout = json.load(layout_file)
+    except OSError:
+        return None
+
+    def map_array(name):
+        return np.asarray(np.load(os.path.join(shared_dataset_path, f'{name}.npy'), mmap_mode='r'))
+
+    columns = {}
+    for column, categories in layout['columns'].items():
+        if categories is None:
+            columns[column] = map_array(column)
+        else:
+            columns[column] = pd.Categorical.from_codes(map_array(column), categories=categories)
+    data = pd.DataFrame(columns, copy=False)
+
+    filter_index = {}
+    for column, value_counts in layout['filter_index'].items():
+        rows_by_value = map_array(f'filter_index-{column}')
+        values = layout['columns'][column] if layout['columns'][column] is not None else [False, True]
+        value_bounds = np.concatenate([[0], np.cumsum(value_counts)])
+        filter_index[column] = {value: rows_by_value[value_bounds[position]:value_bounds[position + 1]]
+                                for position, value in enumerate(values)}
+
+    return data, filter_index
+
+shared_dataset = None
+if shared_dataset_enabled:
+    shared_dataset_path = get_shared_dataset_path(whole_data_set_zip, 'whole_data_set.csv')
+    shared_dataset = read_shared_dataset(shared_dataset_path)
+
+if shared_dataset is not None:
+    whole_data_set = shared_dataset[0]
+else:
+    whole_data_set = read_csv_from_cache(whole_data_set_zip, 'whole_data_set.csv', whole_data_set_columns,
+                                         dtype=whole_data_set_dtypes, prepare=sort_by_movement)
 introduction_glossary = read_csv_from_zip(introduction_glossary_zip, 'introduction_glossary.csv')
 
-# Extract melodic & harmonic notes
+# Note name & note interval decode tables
+
+note_name_labels = whole_data_set['note_name'].cat.categories.to_numpy()
+note_interval_labels = whole_data_set['note_interval'].cat.categories.to_numpy()
+
+# Label interval counts, most common interval first (same order as value_counts)
+
+def order_interval_counts(interval_counts):
+    interval_order = np.argsort(-interval_counts, kind='stable')
+    interval_order = interval_order[interval_counts[interval_order] > 0]
+    return pd.Series(interval_counts[interval_order], index=note_interval_labels[interval_order])
+
+# Movement lookup table (one row per movement id) holding the Piece - Composer & Piece - Movement keys
+
+movements = whole_data_set.drop_duplicates('id')[['id', 'composer', 'composition', 'movement']].reset_index(drop=True)
+movements['piece_composer'] = movements['composition'].astype(str).str.cat(movements['composer'].astype(str), sep=' - ').astype('category')
+movements['piece_movement'] = movements['composition'].astype(str).str.cat(movements['movement'].astype(str), sep=' - ').astype('category')
+
+# Join the keys to every note by movement id so the Piece & Movement filters compare category codes
+# (the shared dataset already holds them)
+
+if shared_dataset is None:
+    note_movement_rows = pd.Index(movements['id']).get_indexer(whole_data_set['id'])
+
+    for movement_key in ['piece_composer', 'piece_movement']:
+        whole_data_set[movement_key] = pd.Categorical.from_codes(movements[movement_key].cat.codes.to_numpy()[note_movement_rows],
+                                                                 dtype=movements[movement_key].dtype)
+
+# Filter index: every dropdown value (and the harmonic & melodic flags) mapped to its sorted row ids
+# The row ids of a column are one argsort, each value's rows are a slice of it
+
+filter_index_columns = ['composer', 'piece_composer', 'piece_movement', 'ensemble', 'instrument_name', 'key_quality',
+                        'note_is_harmonic', 'restored_indexed_note_is_melodic']
+
+empty_rows = np.array([], dtype=np.int32)
+
+def build_filter_index(data, columns):
+    filter_index = {}
+
+    for column in columns:
+        if isinstance(data[column].dtype, pd.CategoricalDtype):
+            values = list(data[column].cat.categories)
+            codes = data[column].cat.codes.to_numpy()
+        else:
+            values = [False, True]
+            codes = data[column].to_numpy().astype(np.int8)
+
+        rows_by_value = np.argsort(codes, kind='stable').astype(np.int32)
+        rows_by_value.flags.writeable = False
+        value_bounds = np.searchsorted(codes[rows_by_value], np.arange(len(values) + 1))
+
+        filter_index[column] = {value: rows_by_value[value_bounds[position]:value_bounds[position + 1]]
+                                for position, value in enumerate(values)}
+
+    return filter_index
+
+if shared_dataset is not None:
+    filter_index = shared_dataset[1]
+else:
+    filter_index = build_filter_index(whole_data_set, filter_index_columns)
+
+    # First process to start writes the shared dataset, then every process maps the same copy
+    if shared_dataset_enabled:
+        try:
+            write_shared_dataset(shared_dataset_path, whole_data_set, filter_index)
+            shared_dataset = read_shared_dataset(shared_dataset_path)
+        except OSError:
+            # Read-only disk: keep this process's own copy
+            pass
+        if shared_dataset is not None:
+            whole_data_set, filter_index = shared_dataset
+
+# Column arrays: the note table columns the callbacks read (category codes for category columns) as read-only
+# views of the table's own arrays, so a request gathers the filtered rows of a column without copying the column
+
+gathered_columns = ['composer', 'piece_composer', 'piece_movement', 'ensemble', 'instrument_name', 'key_quality',
+                    'note_name', 'note_interval', 'melodic_index']
+
+def get_column_array(data, column):
+    if isinstance(data[column].dtype, pd.CategoricalDtype):
+        column_array = data[column].array.codes.view()
+    else:
+        column_array = data[column].to_numpy().view()
+    column_array.flags.writeable = False
+    return column_array
+
+column_arrays = {column: get_column_array(whole_data_set, column) for column in gathered_columns}
+column_categories = {column: whole_data_set[column].cat.categories for column in gathered_columns
+                     if isinstance(whole_data_set[column].dtype, pd.CategoricalDtype)}
+
+# Resolve a filter combination: OR the row ids within a dropdown, AND across dropdowns
+# Returns sorted row ids, or None when nothing is filtered
+
+def get_dimension_rows(filter_index, column, selected_values):
+    value_rows = [filter_index[column].get(value, empty_rows) for value in selected_values]
+    if len(value_rows) == 1:
+        return value_rows[0]
+    return np.sort(np.concatenate(value_rows))
+
+def filter_rows(
+    selected_composers=None,
+    selected_piece_composer_pairs=None,
+    selected_piece_movement_pairs=None,
+    selected_ensembles=None,
+    selected_instruments=None,
+    selected_key_quality=None,
+    radio_value=1,
+    filter_index=filter_index,
+):
+    selections = [
+        ('composer', selected_composers),
+        ('piece_composer', selected_piece_composer_pairs),
+        ('piece_movement', selected_piece_movement_pairs),
+        ('ensemble', selected_ensembles),
+        ('instrument_name', selected_instruments),
+        ('key_quality', selected_key_quality),
+    ]
+
+    # Apply radio filter
+    if radio_value == 2:
+        selections.append(('note_is_harmonic', [True]))
+    elif radio_value == 3:
+        selections.append(('restored_indexed_note_is_melodic', [True]))
+
+    dimension_rows = [get_dimension_rows(filter_index, column, selected_values) for column, selected_values in selections if selected_values]
+
+    if not dimension_rows:
+        return None
+
+    # Intersect from the most selective dropdown up
+    dimension_rows.sort(key=len)
+    rows = dimension_rows[0]
+    for other_rows in dimension_rows[1:]:
+        rows = np.intersect1d(rows, other_rows, assume_unique=True)
+
+    return rows
+
+# Interval count cube: one cell per (movement, instrument, ensemble, key quality, harmonic flag, melodic flag)
+# holding the count of each interval and the count of all notes, indexed like the note table
+
+interval_cube_columns = ['id', 'composer', 'piece_composer', 'piece_movement', 'ensemble', 'instrument_name', 'key_quality',
+                         'note_is_harmonic', 'restored_indexed_note_is_melodic']
+
+def build_interval_cube(data):
+    note_cells = data.groupby(interval_cube_columns, observed=True, sort=False, dropna=False).ngroup().to_numpy()
+    cells, cell_first_rows = np.unique(note_cells, return_index=True)
+    cube = data.iloc[cell_first_rows, data.columns.get_indexer(interval_cube_columns)].reset_index(drop=True)
+
+    note_interval_codes = data['note_interval'].cat.codes.to_numpy()
+    interval_count = len(note_interval_labels)
+    has_interval = note_interval_codes >= 0
+
+    cube_interval_counts = np.bincount(note_cells[has_interval] * interval_count + note_interval_codes[has_interval],
+                                       minlength=len(cells) * interval_count).reshape(len(cells), interval_count)
+    cube_note_counts = np.bincount(note_cells, minlength=len(cells))
+
+    return cube, cube_interval_counts, cube_note_counts
+
+interval_cube, interval_cube_interval_counts, interval_cube_note_counts = build_interval_cube(whole_data_set)
+interval_cube_filter_index = build_filter_index(interval_cube, filter_index_columns)
+
+# Single flight: concurrent calls with the same key wait for the first call's computation and share its result
+# (or its exception); the key is free again once that computation is done
+
+class SingleFlight:
+
+    def __init__(self):
+        self.calls = {}
+        self.coalesced = 0
+        self.lock = threading.Lock()
+
+    def do(self, key, compute):
+        with self.lock:
+            call = self.calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self.calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = compute()
+        except BaseException as error:
+            call['error'] = error
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call['done'].set()
+
+        return call['result']
+
+# Filter result cache: filter results shared by every callback, keyed by the normalized filter state
+# (sorted dropdown values plus the radio selector) and evicted least recently used first
+# Concurrent misses of the same filter state are computed once
+
+class FilterResultCache:
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.single_flight = SingleFlight()
+        self.lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        value = self.single_flight.do(key, compute)
+        if value is not None:
+            value.flags.writeable = False
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = value
+                self.size_bytes += get_result_size(value)
+
+            while self.entries and (len(self.entries) > self.max_entries or self.size_bytes > self.max_bytes):
+                _, evicted_value = self.entries.popitem(last=False)
+                self.size_bytes -= get_result_size(evicted_value)
+                self.evictions += 1
+
+        return value
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'size_bytes': self.size_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'coalesced': self.single_flight.coalesced,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+def get_result_size(value):
+    return 0 if value is None else value.nbytes
+
+filter_result_cache = FilterResultCache(
+    max_entries=int(os.environ.get('FILTER_CACHE_MAX_ENTRIES', 256)),
+    max_bytes=int(os.environ.get('FILTER_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+)
+
+filter_targets = {
+    'notes': filter_index,
+    'interval_cube': interval_cube_filter_index,
+}
+
+filter_target_sizes = {
+    'notes': len(whole_data_set),
+    'interval_cube': len(interval_cube),
+}
+
+def normalize_filter_state(radio_value, *selected_values):
+    return (radio_value,) + tuple(tuple(sorted(values)) if values else () for values in selected_values)
+
+# Filtered rows of a filter target (note rows or interval cube cells), through the filter result cache
 
-whole_data_set_melodic_notes_only = whole_data_set.loc[whole_data_set['restored_indexed_note_is_melodic'] == True]
-whole_data_set_harmonic_notes_only = whole_data_set.loc[whole_data_set['note_is_harmonic'] == True]
+def get_filtered_rows(
+    target,
+    selected_composers=None,
+    selected_piece_composer_pairs=None,
+    selected_piece_movement_pairs=None,
+    selected_ensembles=None,
+    selected_instruments=None,
+    selected_key_quality=None,
+    radio_value=1,
+):
+    filter_state = normalize_filter_state(
+        radio_value,
+        selected_composers,
+        selected_piece_composer_pairs,
+        selected_piece_movement_pairs,
+        selected_ensembles,
+        selected_instruments,
+        selected_key_quality,
+    )
+
+    started = time.perf_counter()
+    filtered_rows = filter_result_cache.get_or_compute(
+        (target,) + filter_state,
+        lambda: filter_rows(*filter_state[1:], radio_value=radio_value, filter_index=filter_targets[target]),
+    )
+    record_filter_stage(target, filter_state, filtered_rows, time.perf_counter() - started)
+
+    return filtered_rows
+
+# Movement partitions: each movement is a contiguous block of rows, in melodic index order
+
+def build_movement_partitions(data):
+    movement_ids = data['id'].to_numpy()
+    partition_ids, partition_starts = np.unique(movement_ids, return_index=True)
+    partition_stops = np.append(partition_starts[1:], len(data))
+    return {int(movement_id): (int(start), int(stop)) for movement_id, start, stop in zip(partition_ids, partition_starts, partition_stops)}
+
+movement_partitions = build_movement_partitions(whole_data_set)
+
+# Movement ids of the selected Piece - Movement pairs
+
+def get_movement_ids(selected_piece_movement_pairs):
+    return movements.loc[movements['piece_movement'].isin(selected_piece_movement_pairs), 'id'].tolist()
+
+# Individual Score Analysis payload: the filtered notes of the selected movements grouped by melodic index
+# (note_offsets[i]:note_offsets[i + 1] are the notes of melodic_indexes[i]), sent as int codes with their
+# decode tables so the browser can step through the movement without a server round trip
+
+def build_score_payload(movement_ids, filtered_rows):
+    score_rows = []
+
+    # Each movement's filtered rows are one contiguous slice of the sorted filtered row ids
+    for movement_id in movement_ids:
+        if movement_id in movement_partitions:
+            partition_start, partition_stop = movement_partitions[movement_id]
+            score_rows.append(filtered_rows[np.searchsorted(filtered_rows, partition_start):np.searchsorted(filtered_rows, partition_stop)])
+
+    score_rows = np.concatenate(score_rows) if score_rows else empty_rows
+    note_melodic_indexes = gather_column(score_rows, 'melodic_index')
+
+    # Notes from several movements are merged by melodic index
+    if len(movement_ids) > 1:
+        melodic_order = np.argsort(note_melodic_indexes, kind='stable')
+        score_rows = score_rows[melodic_order]
+        note_melodic_indexes = note_melodic_indexes[melodic_order]
+
+    note_offsets = np.flatnonzero(np.concatenate([[True], note_melodic_indexes[1:] != note_melodic_indexes[:-1]])) if len(score_rows) else empty_rows
+
+    return {
+        'melodic_indexes': note_melodic_indexes[note_offsets].tolist(),
+        'note_offsets': np.append(note_offsets, len(score_rows)).tolist(),
+        'instruments': gather_column(score_rows, 'instrument_name').tolist(),
+        'intervals': gather_column(score_rows, 'note_interval').tolist(),
+        'note_names': gather_column(score_rows, 'note_name').tolist(),
+        'instrument_labels': column_categories['instrument_name'].tolist(),
+        'interval_labels': note_interval_labels.tolist(),
+        'note_name_labels': note_name_labels.tolist(),
+    }
+
+# Gather one column of the filtered rows (the read-only column array itself when nothing is filtered)
+
+def gather_column(rows, column):
+    if rows is None:
+        return column_arrays[column]
+    return column_arrays[column][rows]
 
 # Misc
 
 key_center = whole_data_set['key_center']
 
-filtered_data = whole_data_set.copy()
-
 # Extract filter options
 
 def get_filter_options(data):
     all_composers = data['composer'].unique()
-    all_piece_composer_pairs = data['composition'].str.cat(data['composer'], sep=' - ').unique()
-    all_piece_movement_pairs = data['composition'].str.cat(data['movement'], sep=' - ').unique()
+    all_piece_composer_pairs = data['piece_composer'].unique()
+    all_piece_movement_pairs = data['piece_movement'].unique()
     all_instruments = data['instrument_name'].unique()
     all_ensembles = data['ensemble'].unique()
     all_key_qualities = data['key_quality'].unique()
@@ -49,104 +617,289 @@ def get_filter_options(data):
     
     return all_composers, all_piece_composer_pairs, all_piece_movement_pairs, all_ensembles, all_instruments, all_key_qualities
 
-(all_composers, all_piece_composer_pairs, all_piece_movement_pairs, all_ensembles, all_instruments, all_key_qualities) = get_filter_options(whole_data_set)
+# Faceted filter options: each dropdown's options with their note counts, summed over the interval cube cells
+# matching the filters, so the work grows with the number of cells (movement x instrument x ...) and not of notes
+# Cells are numbered in order of their first note, so the options come out in order of appearance like Series.unique
+
+filter_option_columns = ['composer', 'piece_composer', 'piece_movement', 'ensemble', 'instrument_name', 'key_quality']
+
+interval_cube_column_arrays = {column: get_column_array(interval_cube, column) for column in filter_option_columns}
+
+def get_faceted_options(filtered_cells, column):
+    codes = interval_cube_column_arrays[column]
+    cell_note_counts = interval_cube_note_counts
+    if filtered_cells is not None:
+        codes = codes[filtered_cells]
+        cell_note_counts = cell_note_counts[filtered_cells]
+
+    option_note_counts = np.bincount(codes[codes >= 0], weights=cell_note_counts[codes >= 0], minlength=len(column_categories[column]))
+    unique_codes, first_cells = np.unique(codes[codes >= 0], return_index=True)
+    option_codes = unique_codes[np.argsort(first_cells)]
+
+    return option_codes, option_note_counts[option_codes].astype(np.int64)
+
+# Dropdown options of faceted filter options, labelled with their note counts
+# The label is a component so the Dropdown component's own search matches the option's search text (its value)
+# and never the count digits (string labels are searched as they are)
+
+def get_dropdown_options(column, option_codes, option_note_counts):
+    return [{'label': html.Span([value, html.Span(f' ({note_count:,})')]), 'value': value, 'search': value}
+            for value, note_count in zip(column_categories[column][option_codes], option_note_counts.tolist())]
+
+# Dropdown search index for the Pieces & Movements dropdowns, which hold one option per piece / movement
+# Every option's distinct lower case whitespace separated tokens, each with the category codes of the options holding
+# it; a query token matches the tokens it is a substring of (one vectorized scan of the distinct tokens), and an
+# option matches a query when it holds a match of every query token, like the Dropdown component's own search
+# (whitespace tokens, all substrings index)
+
+dropdown_search_limit = int(os.environ.get('DROPDOWN_SEARCH_LIMIT', 50))
+
+class DropdownSearchIndex:
+
+    def __init__(self, labels):
+        token_codes = [(token, code) for code, label in enumerate(labels) for token in set(str(label).lower().split())]
+        self.tokens = np.array(sorted({token for token, _ in token_codes}), dtype=str)
+        self.token_ids = np.searchsorted(self.tokens, np.array([token for token, _ in token_codes], dtype=str)).astype(np.int32)
+        self.codes = np.array([code for _, code in token_codes], dtype=np.int32)
+
+    def search(self, query):
+        matches = None
+
+        for query_token in query.lower().split():
+            matching_token_ids = np.flatnonzero(np.char.find(self.tokens, query_token) >= 0)
+            token_matches = np.unique(self.codes[np.isin(self.token_ids, matching_token_ids)])
+            matches = token_matches if matches is None else np.intersect1d(matches, token_matches, assume_unique=True)
+
+        return matches
+
+dropdown_search_indexes = {column: DropdownSearchIndex(column_categories[column]) for column in ['piece_composer', 'piece_movement']}
+
+# Options of a searchable dropdown: the top dropdown_search_limit options matching the search value (most notes
+# first) among the faceted options, or the first ones without a search value, plus the selected options
+
+def search_dropdown_options(column, filter_state, search_value, selected_values):
+    filtered_cells = get_filtered_rows('interval_cube', *get_filter_selections(filter_state))
+    option_codes, option_note_counts = get_faceted_options(filtered_cells, column)
+
+    option_positions = np.arange(len(option_codes))
+    matches = dropdown_search_indexes[column].search(search_value) if search_value else None
+    if matches is not None:
+        option_positions = np.flatnonzero(np.isin(option_codes, matches))
+        option_positions = option_positions[np.argsort(-option_note_counts[option_positions], kind='stable')]
+    option_positions = option_positions[:dropdown_search_limit]
+
+    # Selected options are always sent, the Dropdown component drops selected values missing from its options
+    if selected_values:
+        selected_positions = np.flatnonzero(np.isin(option_codes, column_categories[column].get_indexer(selected_values)))
+        option_positions = np.concatenate([option_positions, np.setdiff1d(selected_positions, option_positions)])
+
+    return get_dropdown_options(column, option_codes[option_positions], option_note_counts[option_positions])
+
+# Memory report: bytes held by the note table and by each structure derived from it, printed to stderr at startup
+# (MEMORY_REPORT=0 turns it off) and exported on /metrics. The radio selector's harmonic & melodic notes are row ids
+# in the filter index, not copies of the table, and column_arrays are views of the note table so they are not counted
+# With SHARED_DATASET=1 the note table and filter index are memory-mapped, held once in the OS page cache by all workers
+
+memory_report_enabled = os.environ.get('MEMORY_REPORT', '1') == '1'
+
+def get_structure_bytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(get_structure_bytes(item) for item in value.values())
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+def get_memory_report():
+    return {
+        'whole_data_set': get_structure_bytes(whole_data_set),
+        'movements': get_structure_bytes(movements),
+        'filter_index': get_structure_bytes(filter_index),
+        'interval_cube': get_structure_bytes(interval_cube) + interval_cube_interval_counts.nbytes + interval_cube_note_counts.nbytes,
+        'interval_cube_filter_index': get_structure_bytes(interval_cube_filter_index),
+        'movement_partitions': get_structure_bytes(movement_partitions),
+    }
+
+memory_report = get_memory_report()
+
+if memory_report_enabled:
+    print(f"Memory ({'shared dataset, memory-mapped' if shared_dataset is not None else 'in process'}):", file=sys.stderr)
+    for structure, structure_bytes in memory_report.items():
+        print(f'  {structure:<28} {structure_bytes / 2 ** 20:9.1f} MB', file=sys.stderr)
+    print(f"  {'total':<28} {sum(memory_report.values()) / 2 ** 20:9.1f} MB", file=sys.stderr, flush=True)
+
+# Introduction artifacts: the initial filter options, card metrics, overall interval ratios and pie chart figures
+# Built from the note table by `python app.py build-artifacts` (or on the first start) and loaded from ARTIFACT_DIR,
+# so startup does not aggregate the whole corpus again
+
+artifact_dir = os.environ.get('ARTIFACT_DIR', 'artifacts')
+introduction_artifacts_version = 1
+
+def get_introduction_artifacts_path():
+    fingerprint = get_zip_fingerprint(whole_data_set_zip, 'whole_data_set.csv')
+    return os.path.join(artifact_dir, f'introduction-{fingerprint}-v{introduction_artifacts_version}.json')
+
+def build_introduction_artifacts(data):
+
+    filter_options = [options.tolist() for options in get_filter_options(data)]
+
+    # Card metrics
+
+    count_of_composers = data['composer'].nunique()
+    count_of_pieces = data['composition'].nunique()
+    count_of_movements = data['id'].nunique()
+    count_of_notes = len(data.index)
+    formatted_count_of_notes = '{:,}'.format(count_of_notes)
+
+    # Pie chart data
+
+    count_of_composition_composer = data.groupby('composer', observed=True)['id'].nunique()
+    percent_pieces_by_composer = (count_of_composition_composer / count_of_pieces) * 100
 
-# Card metrics
+    count_of_pieces_decades = data.groupby('decade', observed=True)['id'].nunique()
+    count_of_pieces_decades_sorted = count_of_pieces_decades.sort_index()
+    percent_pieces_by_decade = (count_of_pieces_decades_sorted / count_of_pieces) * 100
 
-count_of_composers = whole_data_set['composer'].nunique()
-count_of_pieces = whole_data_set['composition'].nunique()
-count_of_movements = whole_data_set['id'].nunique()
-count_of_notes = len(whole_data_set.index)
-formatted_count_of_notes = '{:,}'.format(count_of_notes)
+    composition_year_min = data['composition_year'].min()
+    composition_year_max = data['composition_year'].max()
+    composition_year_min_string = str(composition_year_min)
+    composition_year_max_string = str(composition_year_max)
 
-# Pie chart data
+    composition_year_range = composition_year_min_string + ' - ' + composition_year_max_string
 
-count_of_composition_composer = whole_data_set.groupby('composer')['id'].nunique()
-percent_pieces_by_composer = (count_of_composition_composer / count_of_pieces) * 100
+    count_of_instrument_pieces = data.groupby('instrument_name', observed=True)['id'].nunique()
+    percent_pieces_by_instrument = (count_of_instrument_pieces / count_of_pieces) * 100
 
-count_of_pieces_decades = whole_data_set.groupby('decade')['id'].nunique()
-count_of_pieces_decades_sorted = count_of_pieces_decades.sort_index()
-percent_pieces_by_decade = (count_of_pieces_decades_sorted / count_of_pieces) * 100
+    count_of_major_minor_pieces = data.groupby('key_quality', observed=True)['id'].nunique()
+    percent_pieces_major_minor = (count_of_major_minor_pieces / count_of_pieces) * 100
 
-composition_year_min = whole_data_set['composition_year'].min()
-composition_year_max = whole_data_set['composition_year'].max()
-composition_year_min_string = str(composition_year_min)
-composition_year_max_string = str(composition_year_max)
+    # Diatonic v. Borrowed pie chart logic
 
-composition_year_range = composition_year_min_string + ' - ' + composition_year_max_string
+    borrowed_counts_by_movement = data[data['note_status'] == 'Borrowed'].groupby('id').size().reset_index(name='borrowed_count')
+    diatonic_counts_by_movement = data[data['note_status'] == 'Diatonic'].groupby('id').size().reset_index(name='diatonic_count')
 
-count_of_instrument_pieces = whole_data_set.groupby('instrument_name')['id'].nunique()
-percent_pieces_by_instrument = (count_of_instrument_pieces / count_of_pieces) * 100
+    total_notes_by_movement = data.groupby('id').size().reset_index(name='count_of_notes')
 
-count_of_major_minor_pieces = whole_data_set.groupby('key_quality')['id'].nunique()
-percent_pieces_major_minor = (count_of_major_minor_pieces / count_of_pieces) * 100
+    borrowed_diatonic_count_by_movement = borrowed_counts_by_movement.merge(diatonic_counts_by_movement, how='left', on='id')
+    borrowed_v_diatonic_by_movement = borrowed_diatonic_count_by_movement.merge(total_notes_by_movement, how='left', on='id')
 
-# Diatonic v. Borrowed pie chart logic
+    borrowed_v_diatonic_by_movement['Borrowed'] = borrowed_v_diatonic_by_movement['borrowed_count'] / borrowed_v_diatonic_by_movement['count_of_notes']
+    borrowed_v_diatonic_by_movement['Diatonic'] = borrowed_v_diatonic_by_movement['diatonic_count'] / borrowed_v_diatonic_by_movement['count_of_notes']
 
-borrowed_counts_by_movement = whole_data_set[whole_data_set['note_status'] == 'Borrowed'].groupby('id').size().reset_index(name='borrowed_count')
-diatonic_counts_by_movement = whole_data_set[whole_data_set['note_status'] == 'Diatonic'].groupby('id').size().reset_index(name='diatonic_count')
+    avg_borrowed = borrowed_v_diatonic_by_movement['Borrowed'].mean()
+    avg_diatonic = borrowed_v_diatonic_by_movement['Diatonic'].mean()
 
-total_notes_by_movement = whole_data_set.groupby('id').size().reset_index(name='count_of_notes')
+    diatonic_v_borrowed_ratio = pd.DataFrame({'Diatonic': [avg_diatonic], 'Borrowed': [avg_borrowed]})
 
-borrowed_diatonic_count_by_movement = borrowed_counts_by_movement.merge(diatonic_counts_by_movement, how='left', on='id')
-borrowed_v_diatonic_by_movement = borrowed_diatonic_count_by_movement.merge(total_notes_by_movement, how='left', on='id')
+    interval_ratios = (order_interval_counts(interval_cube_interval_counts.sum(axis=0)) / len(data)) * 100
 
-borrowed_v_diatonic_by_movement['Borrowed'] = borrowed_v_diatonic_by_movement['borrowed_count'] / borrowed_v_diatonic_by_movement['count_of_notes']
-borrowed_v_diatonic_by_movement['Diatonic'] = borrowed_v_diatonic_by_movement['diatonic_count'] / borrowed_v_diatonic_by_movement['count_of_notes']
+    # Pie chart color options
 
-avg_borrowed = borrowed_v_diatonic_by_movement['Borrowed'].mean()
-avg_diatonic = borrowed_v_diatonic_by_movement['Diatonic'].mean()
+    colors = ['gold', 'mediumturquoise', 'darkorange', 'lightgreen']
 
-diatonic_v_borrowed_ratio = pd.DataFrame({'Diatonic': [avg_diatonic], 'Borrowed': [avg_borrowed]})
+    # Figure 1 - Pieces by Composer 
 
-interval_ratios = (whole_data_set['note_interval'].value_counts() / len(whole_data_set)) * 100
+    fig1 = go.Figure(data=[go.Pie(labels=percent_pieces_by_composer.index,
+                                  values=percent_pieces_by_composer.values)])
+    fig1.update_traces(hoverinfo='label+percent', textinfo='label', textfont_size=20,
+                      marker=dict(colors=colors, line=dict(color='#000000', width=2)))
 
-# Pie chart color options
+    # Figure 2 - Pieces by Decade 
 
-colors = ['gold', 'mediumturquoise', 'darkorange', 'lightgreen']
+    fig2 = go.Figure(data=[go.Pie(labels=percent_pieces_by_decade.index,
+                                  values=percent_pieces_by_decade.values,
+                                  sort=False)])
 
-# Figure 1 - Pieces by Composer 
+    fig2.update_traces(hoverinfo='label+percent', textinfo='label', textfont_size=20,
+                       marker=dict(colors=colors, line=dict(color='#000000', width=2)))
 
-fig1 = go.Figure(data=[go.Pie(labels=percent_pieces_by_composer.index,
-                              values=percent_pieces_by_composer.values)])
-fig1.update_traces(hoverinfo='label+percent', textinfo='label', textfont_size=20,
-                  marker=dict(colors=colors, line=dict(color='#000000', width=2)))
+    # Figure 3 - Instruments by Piece 
 
-# Figure 2 - Pieces by Decade 
+    fig3 = go.Figure(data=[go.Pie(labels=percent_pieces_by_instrument.index,
+                                  values=percent_pieces_by_instrument.values)])
+    fig3.update_traces(hoverinfo='label+percent', textinfo='label', textfont_size=20,
+                      marker=dict(colors=colors, line=dict(color='#000000', width=2)))
 
-fig2 = go.Figure(data=[go.Pie(labels=percent_pieces_by_decade.index,
-                              values=percent_pieces_by_decade.values,
-                              sort=False)])
+    # Figure 4 - Major v. Minor Pieces 
 
-fig2.update_traces(hoverinfo='label+percent', textinfo='label', textfont_size=20,
-                   marker=dict(colors=colors, line=dict(color='#000000', width=2)))
+    fig4 = go.Figure(data=[go.Pie(labels=percent_pieces_major_minor.index,
+                                  values=percent_pieces_major_minor.values)])
+    fig4.update_traces(hoverinfo='label+percent', textinfo='label', textfont_size=20,
+                      marker=dict(colors=colors, line=dict(color='#000000', width=2)))
 
-# Figure 3 - Instruments by Piece 
+    # Figure 5 - Diatonic v. Borrowed Notes 
 
-fig3 = go.Figure(data=[go.Pie(labels=percent_pieces_by_instrument.index,
-                              values=percent_pieces_by_instrument.values)])
-fig3.update_traces(hoverinfo='label+percent', textinfo='label', textfont_size=20,
-                  marker=dict(colors=colors, line=dict(color='#000000', width=2)))
+    fig5 = go.Figure()
 
-# Figure 4 - Major v. Minor Pieces 
+    fig5.add_trace(go.Pie(labels=diatonic_v_borrowed_ratio.columns,
+                          values=diatonic_v_borrowed_ratio.iloc[0],
+                          hoverinfo='label+percent', textinfo='label', textfont_size=20,
+                          marker=dict(colors=colors, line=dict(color='#000000', width=2))))
 
-fig4 = go.Figure(data=[go.Pie(labels=percent_pieces_major_minor.index,
-                              values=percent_pieces_major_minor.values)])
-fig4.update_traces(hoverinfo='label+percent', textinfo='label', textfont_size=20,
-                  marker=dict(colors=colors, line=dict(color='#000000', width=2)))
+    return {
+        'filter_options': filter_options,
+        'count_of_composers': int(count_of_composers),
+        'count_of_pieces': int(count_of_pieces),
+        'count_of_movements': int(count_of_movements),
+        'formatted_count_of_notes': formatted_count_of_notes,
+        'composition_year_range': composition_year_range,
+        'interval_ratios': {'intervals': interval_ratios.index.tolist(), 'ratios': interval_ratios.tolist()},
+        'figures': [json.loads(figure.to_json()) for figure in [fig1, fig2, fig3, fig4, fig5]],
+    }
+
+def write_introduction_artifacts(artifacts_path, artifacts):
+    os.makedirs(os.path.dirname(artifacts_path) or '.', exist_ok=True)
+    temp_path = f'{artifacts_path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w') as artifacts_file:
+        json.dump(artifacts, artifacts_file)
+    os.replace(temp_path, artifacts_path)
+
+    remove_stale_caches(artifacts_path)
+
+def read_introduction_artifacts(artifacts_path):
+    try:
+        with open(artifacts_path) as artifacts_file:
+            return json.load(artifacts_file)
+    except OSError:
+        return None
+
+# `python app.py build-artifacts` skips the read so the artifacts are built and written exactly once, here
+
+building_introduction_artifacts = __name__ == '__main__' and sys.argv[1:] == ['build-artifacts']
+introduction_artifacts_path = get_introduction_artifacts_path()
+introduction_artifacts = None if building_introduction_artifacts else read_introduction_artifacts(introduction_artifacts_path)
+
+if introduction_artifacts is None:
+    introduction_artifacts = build_introduction_artifacts(whole_data_set)
+    try:
+        write_introduction_artifacts(introduction_artifacts_path, introduction_artifacts)
+    except OSError:
+        if building_introduction_artifacts:
+            raise
+        # Read-only disk: rebuilt on every start
+        pass
+
+(all_composers, all_piece_composer_pairs, all_piece_movement_pairs, all_ensembles, all_instruments, all_key_qualities) = introduction_artifacts['filter_options']
+
+count_of_composers = introduction_artifacts['count_of_composers']
+count_of_pieces = introduction_artifacts['count_of_pieces']
+count_of_movements = introduction_artifacts['count_of_movements']
+formatted_count_of_notes = introduction_artifacts['formatted_count_of_notes']
+composition_year_range = introduction_artifacts['composition_year_range']
 
-# Figure 5 - Diatonic v. Borrowed Notes 
+interval_ratios = pd.Series(introduction_artifacts['interval_ratios']['ratios'], index=introduction_artifacts['interval_ratios']['intervals'])
 
-fig5 = go.Figure()
+# Figures 1 - 5 as serialized figure dicts, passed to dcc.Graph as they are
 
-fig5.add_trace(go.Pie(labels=diatonic_v_borrowed_ratio.columns,
-                      values=diatonic_v_borrowed_ratio.iloc[0],
-                      hoverinfo='label+percent', textinfo='label', textfont_size=20,
-                      marker=dict(colors=colors, line=dict(color='#000000', width=2))))
+fig1, fig2, fig3, fig4, fig5 = introduction_artifacts['figures']
 # Dash app
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP],
                 meta_tags=[{'name': 'viewport', 'content': 'width=device-width, initial-scale=1.0'}],
                 suppress_callback_exceptions=True,
+                hooks={'request_pre': 'window.dashRequestSession.request_pre'},
                 )
 
 # Dashboard page layouts
@@ -658,7 +1411,7 @@ page_layouts = {
                 dbc.Col([
                     dcc.Dropdown(
                                                                 id='piece-composer-dropdown',
-                                                                options=[{'label': piece_composer_pairs, 'value': piece_composer_pairs} for piece_composer_pairs in all_piece_composer_pairs],
+                                                                options=[{'label': piece_composer_pairs, 'value': piece_composer_pairs} for piece_composer_pairs in all_piece_composer_pairs[:dropdown_search_limit]],
                                                                 optionHeight=50,
                                                                 placeholder="Pieces",
                                                                 value=[],
@@ -668,7 +1421,7 @@ page_layouts = {
                 dbc.Col([
                     dcc.Dropdown(
                                                                 id='piece-movement-dropdown',
-                                                                options=[{'label': piece_movements_pairs, 'value': piece_movements_pairs} for piece_movements_pairs in all_piece_movement_pairs],
+                                                                options=[{'label': piece_movements_pairs, 'value': piece_movements_pairs} for piece_movements_pairs in all_piece_movement_pairs[:dropdown_search_limit]],
                                                                 value=[],
                                                                 optionHeight=80,
                                                                 placeholder="Movements",
@@ -839,7 +1592,7 @@ page_layouts = {
                 dbc.Col([
                     dcc.Dropdown(
                                                                 id='piece-composer-dropdown',
-                                                                options=[{'label': piece_composer_pairs, 'value': piece_composer_pairs} for piece_composer_pairs in all_piece_composer_pairs],
+                                                                options=[{'label': piece_composer_pairs, 'value': piece_composer_pairs} for piece_composer_pairs in all_piece_composer_pairs[:dropdown_search_limit]],
                                                                 optionHeight=50,
                                                                 placeholder="Pieces",
                                                                 value=[],
@@ -850,7 +1603,7 @@ page_layouts = {
                 dbc.Col([
                     dcc.Dropdown(
                                                                 id='piece-movement-dropdown',
-                                                                options=[{'label': piece_movements_pairs, 'value': piece_movements_pairs} for piece_movements_pairs in all_piece_movement_pairs],
+                                                                options=[{'label': piece_movements_pairs, 'value': piece_movements_pairs} for piece_movements_pairs in all_piece_movement_pairs[:dropdown_search_limit]],
                                                                 value=[],
                                                                 optionHeight=80,
                                                                 placeholder="Movements",
@@ -960,6 +1713,12 @@ page_layouts = {
 
             # Previous/Next Note Buttons
 
+            # Current melodic index, kept per browser session rather than in the server process
+            dcc.Store(id='melodic-index-store', storage_type='session'),
+
+            # Notes of the selected movement, sent once per selection for clientside stepping
+            dcc.Store(id='melodic-score-store'),
+
             dbc.Row([
                     dbc.Col([
                             dbc.Button(
@@ -983,6 +1742,32 @@ page_layouts = {
                         ], width=4, className='d-grid gap-2 d-md-flex justify-content-around')
                     ], className='mb-3'),
 
+            # Jump To Note Input & Movement Scrubber
+
+            dbc.Row([
+                    dbc.Col([
+                            dbc.Input(
+                                id='melodic-index-jump',
+                                type='number',
+                                placeholder="Go to note #",
+                                size='sm',
+                                debounce=True,
+                            ),
+                        ], width=2),
+                    dbc.Col([
+                            dcc.Slider(
+                                id='melodic-index-slider',
+                                min=0,
+                                max=0,
+                                step=1,
+                                value=0,
+                                marks=None,
+                                updatemode='mouseup',
+                                tooltip={'placement': 'bottom'},
+                            ),
+                        ]),
+                    ], className='mb-3'),
+
             # Current Note Graph
             dbc.Row([
                 
@@ -1038,9 +1823,353 @@ page_layouts = {
 
 app.layout = html.Div([
     dcc.Location(id='url', refresh=False),
+    dcc.Store(id='filter-state-store'),
     html.Div(id='page-content')
 ])
 
+# Filter result cache stats (hits, misses & evictions for sizing FILTER_CACHE_MAX_ENTRIES / FILTER_CACHE_MAX_BYTES)
+
+@app.server.route('/filter-cache-stats')
+def filter_cache_stats():
+    return flask.jsonify(filter_result_cache.stats())
+
+# Response compression: callback responses, the page and the Dash component bundles & assets of at least
+# COMPRESS_MIN_BYTES are gzipped for browsers that accept it (bundles & assets are compressed once and kept)
+
+compress_min_bytes = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+compress_level = int(os.environ.get('COMPRESS_LEVEL', 6))
+
+compressible_mimetypes = {'application/json', 'application/javascript', 'text/javascript', 'text/css', 'text/html',
+                          'text/plain', 'image/svg+xml'}
+
+static_path_prefixes = (
+    app.config.routes_pathname_prefix + '_dash-component-suites/',
+    app.config.routes_pathname_prefix + app.config.assets_url_path.strip('/') + '/',
+)
+
+# Gzipped static responses, keyed by the path plus Dash's fingerprint query parameters (other query strings are
+# ignored) and bounded least recently used first, since the fingerprint values come from the client
+
+compressed_static_max_entries = int(os.environ.get('COMPRESS_STATIC_MAX_ENTRIES', 256))
+compressed_static_responses = OrderedDict()
+compressed_static_lock = threading.Lock()
+
+def get_static_response_key():
+    return (flask.request.path, flask.request.args.get('v'), flask.request.args.get('m'))
+
+@app.server.after_request
+def compress_response(response):
+    if (response.status_code != 200 or 'Content-Encoding' in response.headers
+            or response.mimetype not in compressible_mimetypes
+            or flask.request.accept_encodings['gzip'] <= 0):
+        return response
+
+    response.direct_passthrough = False
+    data = response.get_data()
+    if len(data) < compress_min_bytes:
+        return response
+
+    if flask.request.path.startswith(static_path_prefixes):
+        static_response_key = get_static_response_key()
+        with compressed_static_lock:
+            compressed_data = compressed_static_responses.get(static_response_key)
+            if compressed_data is not None:
+                compressed_static_responses.move_to_end(static_response_key)
+        if compressed_data is None:
+            compressed_data = gzip.compress(data, compresslevel=compress_level)
+            with compressed_static_lock:
+                compressed_static_responses[static_response_key] = compressed_data
+                while len(compressed_static_responses) > compressed_static_max_entries:
+                    compressed_static_responses.popitem(last=False)
+    else:
+        compressed_data = gzip.compress(data, compresslevel=compress_level)
+
+    response.set_data(compressed_data)
+    response.headers['Content-Encoding'] = 'gzip'
+
+    # The gzipped body is not byte for byte the file the strong ETag names
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    response.vary.add('Accept-Encoding')
+    return response
+
+# Static caching: fingerprinted component bundles and assets (Dash adds the file's mtime as ?m=) never change
+# under the same URL, so browsers & proxies may keep them for a year
+
+@app.server.after_request
+def cache_static_response(response):
+    if response.status_code != 200 or not flask.request.path.startswith(static_path_prefixes):
+        return response
+
+    if response.cache_control.max_age or 'm' in flask.request.args:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
+
+# Callback metrics: wall time, filtering v. figure building time (figure building includes serializing the response),
+# filtered rows, values selected in each filter dropdown (the input filter cardinality) and response size of every
+# callback request, as histograms on /metrics (Prometheus text format, one set per worker process) and with
+# CALLBACK_LOG=1 as one JSON log line per request
+
+callback_log_enabled = os.environ.get('CALLBACK_LOG', '0') == '1'
+
+seconds_buckets = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+callback_metric_definitions = {
+    'dashboard_callback_seconds': ('Callback request wall time', seconds_buckets),
+    'dashboard_callback_stage_seconds': ('Callback time spent filtering and building the figures', seconds_buckets),
+    'dashboard_callback_filtered_rows': ('Rows (or interval cube cells) matched by the callback filters',
+                                         [0, 10, 100, 1000, 10000, 100000, 1000000, 10000000]),
+    'dashboard_callback_filter_values': ('Values selected in each filter dropdown of the callback',
+                                         [0, 1, 2, 3, 5, 10, 25, 50, 100]),
+    'dashboard_callback_response_bytes': ('Serialized callback response size',
+                                          [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216]),
+}
+
+class CallbackMetrics:
+
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name, labels, value):
+        buckets = self.definitions[name][1]
+        key = (name, tuple(sorted(labels.items())))
+
+        with self.lock:
+            histogram = self.histograms.setdefault(key, {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0})
+            position = bisect.bisect_left(buckets, value)
+            if position < len(buckets):
+                histogram['buckets'][position] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def render(self):
+        lines = []
+
+        with self.lock:
+            for name, (description, buckets) in self.definitions.items():
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+
+                for (histogram_name, labels), histogram in sorted(self.histograms.items()):
+                    if histogram_name != name:
+                        continue
+                    label_text = ','.join(f'{label}="{value}"' for label, value in labels)
+                    cumulative_count = 0
+                    for bound, count in zip(buckets, histogram['buckets']):
+                        cumulative_count += count
+                        lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative_count}')
+                    lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram["count"]}')
+                    lines.append(f'{name}_sum{{{label_text}}} {histogram["sum"]!r}')
+                    lines.append(f'{name}_count{{{label_text}}} {histogram["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+callback_metrics = CallbackMetrics(callback_metric_definitions)
+
+# Filter stage of the current callback request (called by get_filtered_rows, the last filter is the callback's own)
+
+def record_filter_stage(target, filter_state, filtered_rows, seconds):
+    if not flask.has_request_context():
+        return
+    flask.g.filter_seconds = flask.g.get('filter_seconds', 0.0) + seconds
+    flask.g.filter_target = target
+    flask.g.filter_values = {column: len(values) for column, values in zip(filter_option_columns, filter_state[1:])}
+    flask.g.filtered_rows = filter_target_sizes[target] if filtered_rows is None else len(filtered_rows)
+
+# Callback name of a request, 'unknown' for outputs no callback writes (the output is client input, so it is
+# never used as a metric label)
+
+def get_callback_name(body):
+    output = body.get('output') if isinstance(body, dict) else None
+    callback_spec = app.callback_map.get(output) if isinstance(output, str) else None
+    return getattr((callback_spec or {}).get('callback'), '__name__', 'unknown')
+
+@app.server.before_request
+def start_callback_timer():
+    if flask.request.path.endswith('/_dash-update-component'):
+        flask.g.callback_started = time.perf_counter()
+
+@app.server.after_request
+def record_callback_metrics(response):
+    if 'callback_started' not in flask.g:
+        return response
+
+    seconds = time.perf_counter() - flask.g.callback_started
+    filter_seconds = flask.g.get('filter_seconds', 0.0)
+    response_bytes = len(response.get_data())
+
+    body = flask.request.get_json(silent=True)
+    if not isinstance(body, dict):
+        body = {}
+    callback_name = get_callback_name(body)
+
+    callback_metrics.observe('dashboard_callback_seconds', {'callback': callback_name}, seconds)
+    callback_metrics.observe('dashboard_callback_stage_seconds', {'callback': callback_name, 'stage': 'filter'}, filter_seconds)
+    callback_metrics.observe('dashboard_callback_stage_seconds', {'callback': callback_name, 'stage': 'figure'}, seconds - filter_seconds)
+    callback_metrics.observe('dashboard_callback_response_bytes', {'callback': callback_name}, response_bytes)
+    if 'filtered_rows' in flask.g:
+        callback_metrics.observe('dashboard_callback_filtered_rows', {'callback': callback_name, 'target': flask.g.filter_target},
+                                 flask.g.filtered_rows)
+        for column, value_count in flask.g.filter_values.items():
+            callback_metrics.observe('dashboard_callback_filter_values', {'callback': callback_name, 'filter': column}, value_count)
+
+    if callback_log_enabled:
+        print(json.dumps({
+            'callback': callback_name,
+            'status': response.status_code,
+            'seconds': round(seconds, 6),
+            'filter_seconds': round(filter_seconds, 6),
+            'filter_target': flask.g.get('filter_target'),
+            'filtered_rows': flask.g.get('filtered_rows'),
+            'filter_values': flask.g.get('filter_values'),
+            'response_bytes': response_bytes,
+            'inputs': {f"{callback_input['id']}.{callback_input['property']}": callback_input.get('value')
+                       for callback_input in body.get('inputs', []) if isinstance(callback_input, dict)},
+        }), file=sys.stderr, flush=True)
+
+    return response
+
+@app.server.route('/metrics')
+def metrics():
+    cache_stats = filter_result_cache.stats()
+    metric_lines = []
+    for stat in ['hits', 'misses', 'evictions', 'coalesced']:
+        metric_lines.append(f'# TYPE dashboard_filter_cache_{stat}_total counter')
+        metric_lines.append(f'dashboard_filter_cache_{stat}_total {cache_stats[stat]}')
+
+    metric_lines.append('# TYPE dashboard_callback_coalesced_total counter')
+    metric_lines.append(f'dashboard_callback_coalesced_total {callback_single_flight.coalesced}')
+    metric_lines.append('# TYPE dashboard_callback_superseded_total counter')
+    metric_lines.append(f'dashboard_callback_superseded_total {request_sequences.superseded}')
+    for stat in ['entries', 'size_bytes']:
+        metric_lines.append(f'# TYPE dashboard_filter_cache_{stat} gauge')
+        metric_lines.append(f'dashboard_filter_cache_{stat} {cache_stats[stat]}')
+
+    metric_lines.append('# TYPE dashboard_memory_bytes gauge')
+    for structure, structure_bytes in memory_report.items():
+        metric_lines.append(f'dashboard_memory_bytes{{structure="{structure}"}} {structure_bytes}')
+
+    return flask.Response(callback_metrics.render() + '\n'.join(metric_lines) + '\n',
+                          mimetype='text/plain; version=0.0.4')
+
+# Request profiler: runs single callback requests under cProfile and writes the stats to PROFILE_DIR as .pstats
+# (snakeviz to browse, flameprof for a flamegraph) plus a top functions summary as .txt
+# Profiles the callbacks named in PROFILE_CALLBACKS (comma separated function names, or 'all'), or any request
+# sent with an X-Profile-Token header matching PROFILE_TOKEN; one request is profiled at a time
+
+profile_dir = os.environ.get('PROFILE_DIR', '.profiles')
+profile_callbacks = set(filter(None, os.environ.get('PROFILE_CALLBACKS', '').split(',')))
+profile_token = os.environ.get('PROFILE_TOKEN', '')
+profiler_lock = threading.Lock()
+
+def should_profile(callback_name):
+    if profile_token and hmac.compare_digest(flask.request.headers.get('X-Profile-Token', ''), profile_token):
+        return True
+    return 'all' in profile_callbacks or callback_name in profile_callbacks
+
+@app.server.before_request
+def start_profiler():
+    if not (profile_callbacks or profile_token) or not flask.request.path.endswith('/_dash-update-component'):
+        return
+
+    callback_name = get_callback_name(flask.request.get_json(silent=True) or {})
+    if should_profile(callback_name) and profiler_lock.acquire(blocking=False):
+        flask.g.profiled_callback = callback_name
+        flask.g.profiler = cProfile.Profile()
+        flask.g.profiler.enable()
+
+@app.server.after_request
+def stop_profiler(response):
+    profiler = flask.g.pop('profiler', None)
+    if profiler is None:
+        return response
+
+    profiler.disable()
+    try:
+        os.makedirs(profile_dir, exist_ok=True)
+        profile_path = os.path.join(profile_dir, f'{flask.g.profiled_callback}-{int(time.time() * 1000)}-{os.getpid()}')
+        profiler.dump_stats(f'{profile_path}.pstats')
+        with open(f'{profile_path}.txt', 'w') as summary_file:
+            pstats.Stats(profiler, stream=summary_file).sort_stats('cumulative').print_stats(40)
+        response.headers['X-Profile-File'] = f'{profile_path}.pstats'
+    except OSError as error:
+        print(f'Could not write the profile of {flask.g.profiled_callback}: {error}', file=sys.stderr, flush=True)
+    finally:
+        profiler_lock.release()
+
+    return response
+
+# Release the profiler when a request ends without a response (after_request skipped)
+
+@app.server.teardown_request
+def release_profiler(error=None):
+    profiler = flask.g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        profiler_lock.release()
+
+# Request coalescing: concurrent requests for a callback with the same inputs wait for one computation and share
+# its result, so many analysts opening the same view cost one computation
+# Requests carry their page's session id and sequence number (assets/request_session.js); a request is dropped
+# (204, no update) when a newer request from the same page for the same callback arrived before its result
+
+class RequestSequences:
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.sequences = OrderedDict()
+        self.superseded = 0
+        self.lock = threading.Lock()
+
+    def start(self, key, sequence):
+        with self.lock:
+            if sequence > self.sequences.get(key, 0):
+                self.sequences[key] = sequence
+            self.sequences.move_to_end(key)
+            while len(self.sequences) > self.max_entries:
+                self.sequences.popitem(last=False)
+
+    def is_superseded(self, key, sequence):
+        with self.lock:
+            is_superseded = self.sequences.get(key, 0) > sequence
+            if is_superseded:
+                self.superseded += 1
+            return is_superseded
+
+callback_single_flight = SingleFlight()
+request_sequences = RequestSequences(max_entries=10000)
+
+def get_request_sequence():
+    body = flask.request.get_json(silent=True) if flask.has_request_context() else None
+    if not isinstance(body, dict) or not isinstance(body.get('session'), str) or not isinstance(body.get('sequence'), int):
+        return None, None
+    return body['session'], body['sequence']
+
+def coalesce_callback(callback):
+
+    @functools.wraps(callback)
+    def coalesced_callback(*args):
+        session, sequence = get_request_sequence()
+        sequence_key = (session, callback.__name__)
+        if session is not None:
+            request_sequences.start(sequence_key, sequence)
+            if request_sequences.is_superseded(sequence_key, sequence):
+                raise PreventUpdate
+
+        result = callback_single_flight.do((callback.__name__, json.dumps(args, sort_keys=True, default=str)), lambda: callback(*args))
+
+        if session is not None and request_sequences.is_superseded(sequence_key, sequence):
+            raise PreventUpdate
+        return result
+
+    return coalesced_callback
+
 
 
 # CALLBACKS
@@ -1066,17 +2195,14 @@ def display_page(pathname):
                 html.P(f'The requested page "{pathname}" was not found. Please navigate using the links.')
             ])
         
-# Dropdowns
+# Filter stage: the filters are evaluated once per change of the dropdowns, the dropdown options, interval ratio
+# graph & score callbacks all read the filter-state-store it writes
+# The stage selects the interval cube cells the dropdown options, dropdown search & interval ratio graph callbacks
+# read (all notes view) into the filter result cache; the store only holds the selections, so any worker can
+# recompute a filter its cache does not hold
 
-@app.callback( 
-    [
-        Output('composer-dropdown', 'options'),
-        Output('piece-composer-dropdown', 'options'),
-        Output('piece-movement-dropdown', 'options'),
-        Output('ensemble-dropdown', 'options'),
-        Output('instrument-dropdown', 'options'),
-        Output('key-quality-dropdown', 'options'),
-    ],
+@app.callback(
+    Output('filter-state-store', 'data'),
     [
         Input('composer-dropdown', 'value'),
         Input('piece-composer-dropdown', 'value'),
@@ -1086,47 +2212,83 @@ def display_page(pathname):
         Input('key-quality-dropdown', 'value'),
     ]
 )
-def update_dropdown_options(
-    selected_composers,
-    selected_piece_composer_pairs,
-    selected_piece_movement_pairs,
-    selected_ensembles,
-    selected_instruments,
-    selected_key_quality,
-):
+@coalesce_callback
+def update_filter_state(*selected_values):
+    get_filtered_rows('interval_cube', *selected_values)
 
-    global filtered_data
-    
-    filtered_data = whole_data_set.copy()
-
-    if selected_composers:
-        filtered_data = filtered_data[filtered_data['composer'].isin(selected_composers)]
-    
-    if selected_piece_composer_pairs:
-        filtered_data = filtered_data[filtered_data['composition'].str.cat(filtered_data['composer'], sep=' - ').isin(selected_piece_composer_pairs)]
-
-    if selected_piece_movement_pairs:
-        filtered_data = filtered_data[filtered_data['composition'].str.cat(filtered_data['movement'], sep=' - ').isin(selected_piece_movement_pairs)]
+    return {
+        'selections': [values or [] for values in selected_values],
+    }
 
-    if selected_ensembles:
-        filtered_data = filtered_data[filtered_data['ensemble'].isin(selected_ensembles)]
+# Dropdown selections of a filter state (nothing selected before the filter stage has run)
 
-    if selected_instruments:
-        filtered_data = filtered_data[filtered_data['instrument_name'].isin(selected_instruments)]
+def get_filter_selections(filter_state):
+    if not filter_state:
+        return [[], [], [], [], [], []]
+    return filter_state['selections']
 
-    if selected_key_quality:
-        filtered_data = filtered_data[filtered_data['key_quality'].isin(selected_key_quality)]
+# Dropdowns
 
-    all_composers, all_piece_composer_pairs, all_piece_movement_pairs, all_ensembles, all_instruments, all_key_qualities = get_filter_options(filtered_data)
+@app.callback( 
+    [
+        Output('composer-dropdown', 'options'),
+        Output('ensemble-dropdown', 'options'),
+        Output('instrument-dropdown', 'options'),
+        Output('key-quality-dropdown', 'options'),
+    ],
+    [
+        Input('filter-state-store', 'data'),
+    ]
+)
+@coalesce_callback
+def update_dropdown_options(filter_state):
+    (selected_composers,
+     selected_piece_composer_pairs,
+     selected_piece_movement_pairs,
+     selected_ensembles,
+     selected_instruments,
+     selected_key_quality) = get_filter_selections(filter_state)
+
+    filtered_cells = get_filtered_rows(
+        'interval_cube',
+        selected_composers,
+        selected_piece_composer_pairs,
+        selected_piece_movement_pairs,
+        selected_ensembles,
+        selected_instruments,
+        selected_key_quality,
+    )
 
     return (
-        [{'label': composers, 'value': composers} for composers in all_composers],
-        [{'label': piece_composer_pairs, 'value': piece_composer_pairs} for piece_composer_pairs in all_piece_composer_pairs],
-        [{'label': piece_movement_pairs, 'value': piece_movement_pairs} for piece_movement_pairs in all_piece_movement_pairs],
-        [{'label': ensembles, 'value': ensembles} for ensembles in all_ensembles],
-        [{'label': instruments, 'value': instruments} for instruments in all_instruments],
-        [{'label': key_quality, 'value': key_quality} for key_quality in all_key_qualities],
+        get_dropdown_options('composer', *get_faceted_options(filtered_cells, 'composer')),
+        get_dropdown_options('ensemble', *get_faceted_options(filtered_cells, 'ensemble')),
+        get_dropdown_options('instrument_name', *get_faceted_options(filtered_cells, 'instrument_name')),
+        get_dropdown_options('key_quality', *get_faceted_options(filtered_cells, 'key_quality')),
     )
+
+# Pieces & Movements dropdowns: searched server side as the user types, only the top matches are sent
+
+@app.callback(
+    Output('piece-composer-dropdown', 'options'),
+    [
+        Input('filter-state-store', 'data'),
+        Input('piece-composer-dropdown', 'search_value'),
+    ]
+)
+@coalesce_callback
+def search_piece_composer_options(filter_state, search_value):
+    return search_dropdown_options('piece_composer', filter_state, search_value, get_filter_selections(filter_state)[1])
+
+@app.callback(
+    Output('piece-movement-dropdown', 'options'),
+    [
+        Input('filter-state-store', 'data'),
+        Input('piece-movement-dropdown', 'search_value'),
+    ]
+)
+@coalesce_callback
+def search_piece_movement_options(filter_state, search_value):
+    return search_dropdown_options('piece_movement', filter_state, search_value, get_filter_selections(filter_state)[2])
     
 
 
@@ -1139,76 +2301,48 @@ def update_dropdown_options(
     ],
     [
         Input('radio-selector', 'value'),
-        Input('composer-dropdown', 'value'),
-        Input('piece-composer-dropdown', 'value'),
-        Input('piece-movement-dropdown', 'value'),
-        Input('ensemble-dropdown', 'value'),
-        Input('instrument-dropdown', 'value'),
-        Input('key-quality-dropdown', 'value'),
-
+        Input('filter-state-store', 'data'),
     ]
 )
-def update_all_notes_graph(
-    radio_value,
-    selected_composers,
-    selected_piece_composer_pairs,
-    selected_piece_movement_pairs,
-    selected_ensembles,
-    selected_instruments,
-    selected_key_quality,
-):
-    filtered_data = whole_data_set.copy()
-
-    # Apply radio filter
-    if radio_value == 2:
-        filtered_data = whole_data_set_harmonic_notes_only
-    elif radio_value == 3:
-        filtered_data = whole_data_set_melodic_notes_only
-
-    # Apply dropdown filters
-    if selected_composers:
-        filtered_data = filtered_data[filtered_data['composer'].isin(selected_composers)]
-    
-    if selected_piece_composer_pairs:
-        filtered_data = filtered_data[filtered_data['composition'].str.cat(filtered_data['composer'], sep=' - ').isin(selected_piece_composer_pairs)]
-
-    if selected_piece_movement_pairs:
-        filtered_data = filtered_data[filtered_data['composition'].str.cat(filtered_data['movement'], sep=' - ').isin(selected_piece_movement_pairs)]
-
-    if selected_ensembles:
-        filtered_data = filtered_data[filtered_data['ensemble'].isin(selected_ensembles)]
-
-    if selected_instruments:
-        filtered_data = filtered_data[filtered_data['instrument_name'].isin(selected_instruments)]
-
-    if selected_key_quality:
-        filtered_data = filtered_data[filtered_data['key_quality'].isin(selected_key_quality)]
+@coalesce_callback
+def update_all_notes_graph(radio_value, filter_state):
+    (selected_composers,
+     selected_piece_composer_pairs,
+     selected_piece_movement_pairs,
+     selected_ensembles,
+     selected_instruments,
+     selected_key_quality) = get_filter_selections(filter_state)
+
+    # Sum the matching cells of the interval count cube
+    filtered_cells = get_filtered_rows(
+        'interval_cube',
+        selected_composers,
+        selected_piece_composer_pairs,
+        selected_piece_movement_pairs,
+        selected_ensembles,
+        selected_instruments,
+        selected_key_quality,
+        radio_value,
+    )
 
-    interval_ratios = (filtered_data['note_interval'].value_counts() / len(filtered_data)) * 100
+    interval_counts = interval_cube_interval_counts
+    note_counts = interval_cube_note_counts
+    if filtered_cells is not None:
+        interval_counts = interval_counts[filtered_cells]
+        note_counts = note_counts[filtered_cells]
 
-    allnotesview = {
-                'data': [
-                            go.Bar(
-                                x=interval_ratios.index,
-                                y=interval_ratios,
-                                texttemplate='%{y:.1f}%',
-                                hoverinfo='none',
-                                hovertemplate='%{x}: %{y:.1f}%',
+    interval_ratios = (order_interval_counts(interval_counts.sum(axis=0)) / note_counts.sum()) * 100
 
-                            )
-                ],
-                'layout': {
-                    'yaxis': {'title': "Ratio of intervals (against key center)", 'showticklabels': False}   
-                }
-    }
+    # Only the bars change, patch x & y into the figure already on the page (trace styling & layout stay client side)
+    allnotesview = Patch()
+    allnotesview['data'][0]['x'] = interval_ratios.index.tolist()
+    allnotesview['data'][0]['y'] = interval_ratios.tolist()
 
     return [allnotesview]
 
 @app.callback(
     [
-        Output('individual-score-analysis-current-note', 'figure'),
-        Output('individual-score-analysis-next-note', 'figure'),
-        Output('individial-score-analysis-previous-note', 'figure'),
+        Output('melodic-score-store', 'data'),
         Output('current-key-center', 'children'),
         Output('individual-score-analysis-composer','children'),
         Output('individual-score-analysis-piece', 'children'),
@@ -1217,282 +2351,85 @@ def update_all_notes_graph(
 
     ],
     [
-        Input('composer-dropdown', 'value'),
-        Input('piece-composer-dropdown', 'value'),
-        Input('piece-movement-dropdown', 'value'),
-        Input('ensemble-dropdown', 'value'),
-        Input('instrument-dropdown', 'value'),
-        Input('key-quality-dropdown', 'value'),
-        Input('melodic-index-reset', 'n_clicks'),
-        Input('melodic-index-previous-note', 'n_clicks'),
-        Input('melodic-index-next-note', 'n_clicks'),
-    ],
-    [
-        State('individual-score-analysis-current-note', 'figure'),
-        State('individual-score-analysis-next-note', 'figure'),
-        State('individial-score-analysis-previous-note', 'figure'),
-        State('current-key-center', 'children'),
-        State('individual-score-analysis-composer','children'),
-        State('individual-score-analysis-piece', 'children'),
-        State('individual-score-analysis-movement', 'children'),
-        State('individual-score-analysis-instructions', 'children'),
-     ]
+        Input('filter-state-store', 'data'),
+    ]
 )
-def update_melodic_graphs(
-    selected_composers,
-    selected_piece_composer_pairs,
-    selected_piece_movement_pairs,
-    selected_ensembles,
-    selected_instruments,
-    selected_key_quality,
-    empty_current_note_graph,
-    empty_previous_note_graph,
-    empty_next_note_graph,
-    current_note_graph,
-    previous_note_graph,
-    next_note_graph,
-    current_key_center,
-    individual_score_analysis_composer,
-    individual_score_analysis_piece,
-    individual_score_analysis_movement,
-    individual_score_analysis_instructions,
-):
-    
-    global melodic_index
-
-    # Determine which button was clicked
-    ctx = dash.callback_context
-    triggered_id = ctx.triggered[0]['prop_id'].split('.')[0]
+@coalesce_callback
+def update_melodic_graphs(filter_state):
+    (selected_composers,
+     selected_piece_composer_pairs,
+     selected_piece_movement_pairs,
+     selected_ensembles,
+     selected_instruments,
+     selected_key_quality) = get_filter_selections(filter_state)
 
-    filtered_data = whole_data_set.copy()
-
-    empty_current_note_graph = {
-        'data': [
-            go.Bar(
-
-                name="Current Note"
-            )
-        ],
-        'layout': {
-            'title': f"",
-            'yaxis': {'showticklabels': False},
-            'xaxis': {'showticklabels': False}
-        }
-    }
-
-    empty_previous_note_graph = {
-        'data': [
-            go.Bar(
-
-                name="Previous Note"
-            )
-        ],
-        'layout': {
-            'title': f"",
-            'yaxis': {'showticklabels': False},
-            'xaxis': {'showticklabels': False}
-        }
-    }
-
-    empty_next_note_graph = {
-        'data': [
-            go.Bar(
-
-                name="Next Note"
-                )
-            ],
-            'layout': {
-                'title': f"",
-                'yaxis': {'showticklabels': False},
-                'xaxis': {'showticklabels': False}
-            }
-    }
-    empty_composer = ""
-    empty_piece = ""
-    empty_movement = ""
-    empty_current_key_center = ""
-
-    if selected_composers:
-        filtered_data = filtered_data[filtered_data['composer'].isin(selected_composers)]
-
-    if selected_piece_composer_pairs:
-        filtered_data = filtered_data[filtered_data['composition'].str.cat(filtered_data['composer'], sep=' - ').isin(selected_piece_composer_pairs)]
-
-    if selected_piece_movement_pairs:
-        filtered_data = filtered_data[filtered_data['composition'].str.cat(filtered_data['movement'], sep=' - ').isin(selected_piece_movement_pairs)]
-    
-        if not filtered_data.empty:
-            current_key_center = filtered_data['key_center'].iloc[0] + ' ' + filtered_data['key_quality'].iloc[0]
-            individual_score_analysis_composer = filtered_data['composer'].iloc[0]
-            individual_score_analysis_piece = filtered_data['composition'].iloc[0]
-            individual_score_analysis_movement = filtered_data['movement'].iloc[0]
-        else:
-            current_key_center = ""
-            individual_score_analysis_composer = ""
-            individual_score_analysis_piece = ""
-            individual_score_analysis_movement = ""
-
-    if selected_ensembles:
-        filtered_data = filtered_data[filtered_data['ensemble'].isin(selected_ensembles)]
-
-    if selected_instruments:
-        filtered_data = filtered_data[filtered_data['instrument_name'].isin(selected_instruments)]
-
-
-    if selected_key_quality:
-        filtered_data = filtered_data[filtered_data['key_quality'].isin(selected_key_quality)]
-
-    empty_dropdowns = all(not var for var in (selected_composers, selected_piece_composer_pairs, selected_piece_movement_pairs, selected_ensembles, selected_instruments, selected_key_quality))
-
-    no_buttons_clicked = all(not var for var in (triggered_id == 'melodic-index-reset', triggered_id == 'melodic-index-previous-note', triggered_id == 'melodic-index-next-note'))
-
-   # Calculate the minimum and maximum melodic index for the filtered data
-    min_melodic_index = filtered_data['melodic_index'].min()
-    max_melodic_index = filtered_data['melodic_index'].max()
-
-
-    # Function to find the next available melodic index
-    def find_next_melodic_index(start_index, step):
-        index = start_index
-        while index >= min_melodic_index and index <= max_melodic_index:
-            if index in filtered_data['melodic_index'].values:
-                return index
-            index += step
-
-    # Update melodic index based on button clicks
-    if (empty_dropdowns and no_buttons_clicked) or (selected_instruments and no_buttons_clicked):
-        melodic_index = min_melodic_index
-    elif triggered_id == 'melodic-index-reset':
-        melodic_index = min_melodic_index
-    elif triggered_id == 'melodic-index-previous-note' and melodic_index > min_melodic_index:
-        melodic_index = find_next_melodic_index(melodic_index - 1, -1)
-    elif triggered_id == 'melodic-index-next-note' and melodic_index < max_melodic_index:
-        melodic_index = find_next_melodic_index(melodic_index + 1, 1)
-
-    # Find the next and previous available melodic indexes
-    prev_melodic_index = find_next_melodic_index(melodic_index - 1, -1)
-    next_melodic_index = find_next_melodic_index(melodic_index + 1, 1)
-
-    # Filter data for the current, next, and previous melodic indexes
-    filtered_current_note = filtered_data.loc[filtered_data['melodic_index'] == melodic_index]
-    filtered_prev_note = filtered_data.loc[filtered_data['melodic_index'] == prev_melodic_index]
-    filtered_next_note = filtered_data.loc[filtered_data['melodic_index'] == next_melodic_index]
-
-    grouped_current_intervals_notes = filtered_current_note.groupby(['instrument_name', 'note_interval'])['note_name'].apply(list)
-    grouped_prev_intervals_notes = filtered_prev_note.groupby(['instrument_name', 'note_interval'])['note_name'].apply(list)
-    grouped_next_intervals_notes = filtered_next_note.groupby(['instrument_name', 'note_interval'])['note_name'].apply(list)
-
-
-    current_note_graph = {
-        'data': [
-            go.Bar(
-                x=grouped_current_intervals_notes.index.get_level_values('note_interval'),
-                y=filtered_current_note['note_interval'].value_counts().values,
-                name="Current Note",
-                hoverinfo='none',
-                text=[
-                    f"{instrument}<br><br>{', '.join(notes)}"
-                    for (instrument, interval), notes in grouped_current_intervals_notes.items()
-                ],
-                textposition='auto',
-                textfont=dict(
-                    family='Arial',
-                    size=12,
-                )
+    if not selected_piece_movement_pairs:
+        return (
+                None,
+                "",
+                "",
+                "",
+                "",
+                html.H4("Select a piece and movement to begin", className='card-title'),
             )
-        ],
-        'layout': {
-            'title': f"Current Note(s) # {melodic_index}",
-            'yaxis': {'showticklabels': False}
-        }
-    }
 
+    movement_rows = get_filtered_rows('notes', selected_composers, selected_piece_composer_pairs, selected_piece_movement_pairs)
 
-    if prev_melodic_index is not None:
-        previous_note_graph = {
-            'data': [
-                go.Bar(
-                    x=grouped_prev_intervals_notes.index.get_level_values('note_interval'),
-                    y=filtered_prev_note['note_interval'].value_counts().values,
-                    name="Current Note",
-                    hoverinfo='none',
-                    text=[
-                        f"{instrument}<br><br>{', '.join(notes)}"
-                        for (instrument, interval), notes in grouped_prev_intervals_notes.items()
-                    ],
-                    textposition='auto',
-                    textfont=dict(
-                        family='Arial',
-                        size=12,
-                    )
-                )
-            ],
-            'layout': {
-                'title': f"Previous Note(s) # {prev_melodic_index}" if prev_melodic_index is not None else f"Previous Note(s) # ",
-                'yaxis': {'showticklabels': False}
-            }
-        }
-    
+    if len(movement_rows):
+        first_note = {column: whole_data_set[column].iat[movement_rows[0]]
+                      for column in ['key_center', 'key_quality', 'composer', 'composition', 'movement']}
+        current_key_center = first_note['key_center'] + ' ' + first_note['key_quality']
+        individual_score_analysis_composer = first_note['composer']
+        individual_score_analysis_piece = first_note['composition']
+        individual_score_analysis_movement = first_note['movement']
     else:
-        previous_note_graph = {
-        'data': [
-            go.Bar(
-
-                name="Previous Note"
-            )
-        ],
-        'layout': {
-            'title': f"Previous Note(s) # ",
-            'yaxis': {'showticklabels': False},
-            'xaxis': {'showticklabels': False}
-        }
-    }
-
-
-    next_note_graph = {
-        'data': [
-            go.Bar(
-                x=grouped_next_intervals_notes.index.get_level_values('note_interval'),
-                y=filtered_next_note['note_interval'].value_counts().values,
-                name="Next Note",
-                hoverinfo='none',
-                text=[
-                    f"{instrument}<br><br>{', '.join(notes)}"
-                    for (instrument, interval), notes in grouped_next_intervals_notes.items()
-                ],
-                textposition='auto',
-                textfont=dict(
-                    family='Arial',
-                    size=12,
-                )
-            )
-        ],
+        current_key_center = ""
+        individual_score_analysis_composer = ""
+        individual_score_analysis_piece = ""
+        individual_score_analysis_movement = ""
+
+    filtered_rows = get_filtered_rows(
+        'notes',
+        selected_composers,
+        selected_piece_composer_pairs,
+        selected_piece_movement_pairs,
+        selected_ensembles,
+        selected_instruments,
+        selected_key_quality,
+    )
 
-        'layout': {
-            'title': f"Next Note(s) # {next_melodic_index}",
-            'yaxis': {'showticklabels': False}
-        }
-    }
+    # One payload per selection, the note graphs are stepped through in the browser (assets/score_stepping.js)
+    score = build_score_payload(get_movement_ids(selected_piece_movement_pairs), filtered_rows)
 
     individual_score_analysis_instructions = ""
-     
 
-    if not selected_piece_movement_pairs:
-        return (
-                empty_current_note_graph,
-                empty_previous_note_graph,
-                empty_next_note_graph,
-                empty_composer,
-                empty_piece,
-                empty_movement,
-                empty_current_key_center,
-                html.H4("Select a piece and movement to begin", className='card-title'),
-            )
-    else:
+    return score, current_key_center, individual_score_analysis_composer, individual_score_analysis_piece, individual_score_analysis_movement, individual_score_analysis_instructions
 
-        return current_note_graph, previous_note_graph, next_note_graph, current_key_center, individual_score_analysis_composer, individual_score_analysis_piece, individual_score_analysis_movement, individual_score_analysis_instructions
+# Individual Score Analysis - Next, Previous, Reset, Jump To Note & Scrubber (clientside)
 
-    
+app.clientside_callback(
+    ClientsideFunction(namespace='score', function_name='step_notes'),
+    [
+        Output('individual-score-analysis-current-note', 'figure'),
+        Output('individual-score-analysis-next-note', 'figure'),
+        Output('individial-score-analysis-previous-note', 'figure'),
+        Output('melodic-index-store', 'data'),
+        Output('melodic-index-slider', 'min'),
+        Output('melodic-index-slider', 'max'),
+        Output('melodic-index-slider', 'value'),
+    ],
+    [
+        Input('melodic-score-store', 'data'),
+        Input('melodic-index-reset', 'n_clicks'),
+        Input('melodic-index-previous-note', 'n_clicks'),
+        Input('melodic-index-next-note', 'n_clicks'),
+        Input('melodic-index-jump', 'value'),
+        Input('melodic-index-slider', 'value'),
+    ],
+    [
+        State('melodic-index-store', 'data'),
+    ]
+)
 
 
 @app.callback(
@@ -1681,5 +2618,12 @@ def toggle_limitations_collapse(n, is_open):
         return not is_open
     return is_open
 
+# Development server only (debug off unless DASH_DEBUG=1), production runs wsgi.py under gunicorn
+# `python app.py build-artifacts` rebuilds the Introduction artifacts (at import, see Introduction artifacts) instead
+# of serving
+
 if __name__ == '__main__':
-    app.run_server(debug=True)
\ No newline at end of file
+    if building_introduction_artifacts:
+        print(f'Wrote {introduction_artifacts_path}')
+    else:
+        app.run(debug=os.environ.get('DASH_DEBUG', '0') == '1')
\ No newline at end of file
@@ -0,0 +1,18 @@
+// Callback request session
+//
+// Tags every callback request with this page's session id and a request sequence number (the renderer's request_pre
+// hook, see the Dash app in app.py), so the server can drop a request superseded by a newer request from the same
+// page for the same callback before computing it (see Request coalescing in app.py).
+
+window.dashRequestSession = (function () {
+    const session = Math.random().toString(36).slice(2) + Date.now().toString(36);
+    let sequence = 0;
+
+    return {
+        request_pre: function (payload) {
+            sequence += 1;
+            payload.session = session;
+            payload.sequence = sequence;
+        },
+    };
+}());
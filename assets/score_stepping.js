@@ -0,0 +1,131 @@
+// Individual Score Analysis - clientside note stepping
+//
+// The server sends one payload per piece/movement selection (see build_score_payload in app.py).
+// Next, previous, reset, jump to note and the scrubber are resolved here without a server round trip.
+
+// First position in a sorted array whose value is >= target
+
+function lowerBound(values, target) {
+    let low = 0;
+    let high = values.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (values[middle] < target) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+    return low;
+}
+
+function emptyNoteGraph(name) {
+    return {
+        'data': [{'type': 'bar', 'name': name}],
+        'layout': {
+            'title': "",
+            'yaxis': {'showticklabels': false},
+            'xaxis': {'showticklabels': false}
+        }
+    };
+}
+
+// Bars of one melodic index, one per (instrument, interval) group with the group's note names as text
+
+function noteGraph(score, position, name, title) {
+    if (position === null) {
+        const graph = emptyNoteGraph(name);
+        graph.layout.title = title + " # ";
+        return graph;
+    }
+
+    const groups = new Map();
+    const intervalCount = score.interval_labels.length;
+
+    for (let note = score.note_offsets[position]; note < score.note_offsets[position + 1]; note++) {
+        const group = score.instruments[note] * intervalCount + score.intervals[note];
+        if (!groups.has(group)) {
+            groups.set(group, []);
+        }
+        groups.get(group).push(score.note_name_labels[score.note_names[note]]);
+    }
+
+    const x = [];
+    const y = [];
+    const text = [];
+
+    // Groups in instrument then interval order, like groupby(['instrument_name', 'note_interval'])
+    Array.from(groups.keys()).sort((a, b) => a - b).forEach(group => {
+        const notes = groups.get(group);
+        x.push(score.interval_labels[group % intervalCount]);
+        y.push(notes.length);
+        text.push(score.instrument_labels[Math.floor(group / intervalCount)] + "<br><br>" + notes.join(", "));
+    });
+
+    return {
+        'data': [{
+            'type': 'bar',
+            'x': x,
+            'y': y,
+            'name': name,
+            'hoverinfo': 'none',
+            'text': text,
+            'textposition': 'auto',
+            'textfont': {'family': 'Arial', 'size': 12}
+        }],
+        'layout': {
+            'title': title + " # " + score.melodic_indexes[position],
+            'yaxis': {'showticklabels': false}
+        }
+    };
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    score: {
+        step_notes: function(score, resetClicks, previousClicks, nextClicks, jumpToMelodicIndex, sliderMelodicIndex, melodicIndex) {
+            if (!score || score.melodic_indexes.length === 0) {
+                return [
+                    emptyNoteGraph("Current Note"),
+                    emptyNoteGraph("Next Note"),
+                    emptyNoteGraph("Previous Note"),
+                    null,
+                    0,
+                    0,
+                    0
+                ];
+            }
+
+            const triggeredId = dash_clientside.callback_context.triggered[0].prop_id.split('.')[0];
+            const melodicIndexes = score.melodic_indexes;
+            const lastPosition = melodicIndexes.length - 1;
+
+            // A new selection starts from its first note
+            let position = 0;
+            if (melodicIndex !== null && melodicIndex !== undefined && triggeredId !== 'melodic-score-store') {
+                position = Math.min(lowerBound(melodicIndexes, melodicIndex), lastPosition);
+            }
+
+            if (triggeredId === 'melodic-index-reset') {
+                position = 0;
+            } else if (triggeredId === 'melodic-index-previous-note') {
+                position = Math.max(position - 1, 0);
+            } else if (triggeredId === 'melodic-index-next-note') {
+                position = Math.min(position + 1, lastPosition);
+            } else if (triggeredId === 'melodic-index-jump' && jumpToMelodicIndex !== null && jumpToMelodicIndex !== undefined) {
+                position = Math.min(lowerBound(melodicIndexes, jumpToMelodicIndex), lastPosition);
+            } else if (triggeredId === 'melodic-index-slider' && sliderMelodicIndex !== null && sliderMelodicIndex !== undefined) {
+                position = Math.min(lowerBound(melodicIndexes, sliderMelodicIndex), lastPosition);
+            }
+
+            return [
+                noteGraph(score, position, "Current Note", "Current Note(s)"),
+                noteGraph(score, position < lastPosition ? position + 1 : null, "Next Note", "Next Note(s)"),
+                noteGraph(score, position > 0 ? position - 1 : null, "Previous Note", "Previous Note(s)"),
+                melodicIndexes[position],
+                melodicIndexes[0],
+                melodicIndexes[lastPosition],
+                melodicIndexes[position]
+            ];
+        }
+    }
+});
@@ -0,0 +1,44 @@
+# Dash callback requests
+#
+# Builds the JSON body the Dash renderer posts to /_dash-update-component, so benchmarks and load tests
+# drive the callbacks exactly like a browser does (dispatch, validation and response serialization included).
+# The callback map is app.callback_map in process, or read from a running server's /_dash-dependencies.
+
+callback_endpoint = '/_dash-update-component'
+dependencies_endpoint = '/_dash-dependencies'
+
+def get_callback_map(dependencies):
+    return {callback['output']: callback for callback in dependencies}
+
+# Find the callback_map key of the callback writing an output, e.g. 'aha-interval-ratio-graph.figure'
+
+def find_callback(callback_map, output):
+    for output_key in callback_map:
+        if output in output_key.strip('.').split('...'):
+            return output_key
+    raise KeyError(f'No callback writes {output}')
+
+# values: {'<component id>.<property>': value} for the callback's inputs & state,
+# triggered: the '<component id>.<property>' inputs that changed (empty on the initial call)
+
+def build_callback_request(callback_map, output_key, values, triggered=None):
+    callback = callback_map[output_key]
+    multiple_outputs = output_key.startswith('..')
+
+    outputs = []
+    for output in output_key.strip('.').split('...'):
+        component_id, component_property = output.rsplit('.', 1)
+        outputs.append({'id': component_id, 'property': component_property})
+
+    def get_values(dependencies):
+        return [{'id': dependency['id'], 'property': dependency['property'],
+                 'value': values.get(f"{dependency['id']}.{dependency['property']}")}
+                for dependency in dependencies]
+
+    return {
+        'output': output_key,
+        'outputs': outputs if multiple_outputs else outputs[0],
+        'inputs': get_values(callback['inputs']),
+        'state': get_values(callback['state']),
+        'changedPropIds': triggered or [],
+    }
@@ -0,0 +1,283 @@
+# Concurrent-user load test
+#
+# Replays analyst sessions against /_dash-update-component with a rising number of simultaneous users and
+# reports throughput, p50 / p95 / p99 latency, error rate and state mixing between sessions at each level.
+#
+#   python benchmarks/load_test.py --concurrency 1,4,16,64                      (local dev server, synthetic corpus)
+#   python benchmarks/load_test.py --server gunicorn --scale 10 --concurrency 8,32
+#   python benchmarks/load_test.py --url http://dashboard.internal:8050         (an already running server)
+#
+# A session opens Aggregated Harmonic Analysis, picks composers, toggles the radio selector through all notes,
+# harmonic & melodic, then opens Individual Score Analysis and picks a movement. Note stepping runs in the
+# browser, so it sends no requests.
+# State mixing is flagged when a movement's header names another movement, or when identical requests get
+# different responses.
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import requests
+
+from dash_requests import callback_endpoint, dependencies_endpoint, get_callback_map, find_callback, build_callback_request
+from synthetic_corpus import get_corpus
+
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+repository_dir = os.path.dirname(benchmarks_dir)
+
+filter_dropdowns = ['composer-dropdown', 'piece-composer-dropdown', 'piece-movement-dropdown', 'ensemble-dropdown',
+                    'instrument-dropdown', 'key-quality-dropdown']
+
+dev_server_script = '''
+import sys
+import app
+app.app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)
+'''
+
+# Local server with the synthetic corpus: the Dash dev server (threaded) or gunicorn with gunicorn.conf.py
+# Its dataset cache & artifacts go to a temporary work directory, so it never touches (or cleans up) the real corpus's
+
+def get_free_port():
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        return free_socket.getsockname()[1]
+
+def start_server(server, corpus_path, work_dir):
+    port = get_free_port()
+    environment = dict(os.environ, WHOLE_DATA_SET_ZIP=corpus_path,
+                       DATASET_CACHE_DIR=os.path.join(work_dir, 'dataset_cache'),
+                       ARTIFACT_DIR=os.path.join(work_dir, 'artifacts'))
+
+    if server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', 'wsgi:server']
+    else:
+        command = [sys.executable, '-c', dev_server_script, str(port)]
+
+    process = subprocess.Popen(command, cwd=repository_dir, env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f'http://127.0.0.1:{port}'
+
+    deadline = time.time() + 600
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{server} server exited with {process.returncode}')
+        try:
+            requests.get(url + dependencies_endpoint, timeout=1).raise_for_status()
+            return process, url
+        except requests.RequestException:
+            time.sleep(0.5)
+
+    process.terminate()
+    raise RuntimeError(f'{server} server did not start')
+
+# Load test state shared by the virtual users of one concurrency level
+
+class LoadTestStats:
+
+    def __init__(self):
+        self.latencies = []
+        self.requests = 0
+        self.errors = 0
+        self.sessions = 0
+        self.state_mixing = 0
+        self.responses = {}
+        self.lock = threading.Lock()
+
+    def record(self, request_key, latency, response_digest):
+        with self.lock:
+            self.requests += 1
+            if response_digest is None:
+                self.errors += 1
+                return
+            self.latencies.append(latency)
+            if self.responses.setdefault(request_key, response_digest) != response_digest:
+                self.state_mixing += 1
+
+    def record_state_mixing(self):
+        with self.lock:
+            self.state_mixing += 1
+
+    def record_session(self):
+        with self.lock:
+            self.sessions += 1
+
+# One virtual user: a requests session replaying analyst sessions until the level ends
+
+class AnalystSession:
+
+    def __init__(self, url, callback_map, stats, think_time, seed):
+        self.url = url
+        self.callback_map = callback_map
+        self.stats = stats
+        self.think_time = think_time
+        self.random = random.Random(seed)
+        self.http = requests.Session()
+        self.filter_state = None
+
+        self.page_callback = find_callback(callback_map, 'page-content.children')
+        self.filter_state_callback = 'filter-state-store.data' if 'filter-state-store.data' in callback_map else None
+        self.options_callback = find_callback(callback_map, 'composer-dropdown.options')
+        self.search_options_callbacks = [output_key for output_key in ['piece-composer-dropdown.options', 'piece-movement-dropdown.options']
+                                         if output_key in callback_map]
+        self.aha_callback = find_callback(callback_map, 'aha-interval-ratio-graph.figure')
+        self.score_callback = find_callback(callback_map, 'melodic-score-store.data')
+
+    def post(self, output_key, values, triggered=None):
+        request = build_callback_request(self.callback_map, output_key, values, triggered)
+        request_key = json.dumps([request['output'], request['inputs'], request['state']], sort_keys=True)
+
+        started = time.perf_counter()
+        try:
+            response = self.http.post(self.url + callback_endpoint, json=request, timeout=60)
+            latency = time.perf_counter() - started
+            response.raise_for_status()
+        except requests.RequestException:
+            self.stats.record(request_key, time.perf_counter() - started, None)
+            return None
+
+        self.stats.record(request_key, latency, hashlib.sha1(response.content).hexdigest())
+        return response.json()['response'] if response.content else {}
+
+    def filter_change(self, selections, radio_value, page, triggered):
+        values = {f'{dropdown}.value': selections.get(dropdown, []) for dropdown in filter_dropdowns}
+        values['radio-selector.value'] = radio_value
+
+        # The filter stage runs first on a dropdown change, the other callbacks read the filter state it writes
+        # (the radio selector is not a filter, so toggling it reuses the current filter state)
+        if self.filter_state_callback is not None:
+            if triggered != ['radio-selector.value']:
+                filter_state = self.post(self.filter_state_callback, values, triggered)
+                self.filter_state = filter_state['filter-state-store']['data'] if filter_state else None
+                triggered = ['filter-state-store.data']
+            values['filter-state-store.data'] = self.filter_state
+
+        options = self.post(self.options_callback, values, triggered)
+        for search_options_callback in self.search_options_callbacks:
+            search_options = self.post(search_options_callback, values, triggered)
+            if options is not None and search_options is not None:
+                options.update(search_options)
+        if page == 'aha':
+            self.post(self.aha_callback, values, triggered)
+        else:
+            score = self.post(self.score_callback, values, triggered)
+            self.check_score_header(selections.get('piece-movement-dropdown'), score)
+
+        if self.think_time:
+            time.sleep(self.random.uniform(0, 2 * self.think_time))
+        return options
+
+    def check_score_header(self, selected_piece_movement_pairs, score):
+        if not selected_piece_movement_pairs or not score or not score['melodic-score-store']['data']:
+            return
+        piece = score['individual-score-analysis-piece']['children']
+        movement = score['individual-score-analysis-movement']['children']
+        if f'{piece} - {movement}' not in selected_piece_movement_pairs:
+            self.stats.record_state_mixing()
+
+    def pick(self, options, count):
+        values = [option['value'] for option in options or []]
+        return self.random.sample(values, min(count, len(values)))
+
+    def run(self, stop_event):
+        while not stop_event.is_set():
+            # Aggregated Harmonic Analysis: composers, then every radio selector value
+
+            self.post(self.page_callback, {'url.pathname': '/aggregated_harmonic_analysis'})
+            options = self.filter_change({}, 1, 'aha', [])
+            if options is None:
+                continue
+
+            selections = {'composer-dropdown': self.pick(options['composer-dropdown']['options'], self.random.randint(1, 3))}
+            options = self.filter_change(selections, 1, 'aha', ['composer-dropdown.value'])
+            for radio_value in [2, 3, 1]:
+                self.filter_change(selections, radio_value, 'aha', ['radio-selector.value'])
+
+            # Individual Score Analysis: one movement of those composers
+
+            self.post(self.page_callback, {'url.pathname': '/individual_score_analysis'})
+            self.filter_change(selections, 1, 'isa', [])
+            if options is not None:
+                selections['piece-movement-dropdown'] = self.pick(options['piece-movement-dropdown']['options'], 1)
+                self.filter_change(selections, 1, 'isa', ['piece-movement-dropdown.value'])
+
+            self.stats.record_session()
+
+def run_level(url, callback_map, users, duration, think_time):
+    stats = LoadTestStats()
+    stop_event = threading.Event()
+    sessions = [AnalystSession(url, callback_map, stats, think_time, seed=user) for user in range(users)]
+    threads = [threading.Thread(target=session.run, args=(stop_event,), daemon=True) for session in sessions]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array(stats.latencies) * 1000 if stats.latencies else np.zeros(1)
+    return {
+        'users': users,
+        'seconds': elapsed,
+        'sessions': stats.sessions,
+        'requests': stats.requests,
+        'throughput_rps': stats.requests / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'error_rate': stats.errors / stats.requests if stats.requests else 0.0,
+        'state_mixing': stats.state_mixing,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the dashboard callbacks with concurrent analyst sessions')
+    parser.add_argument('--url', default=None, help='running server to test (default: start a local one)')
+    parser.add_argument('--server', choices=['dev', 'gunicorn'], default='dev', help='local server to start')
+    parser.add_argument('--scale', type=float, default=1.0, help='synthetic corpus size for the local server')
+    parser.add_argument('--concurrency', default='1,2,4,8,16,32', help='simultaneous users at each level')
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds per level')
+    parser.add_argument('--think-time', type=float, default=0.0, help='mean pause between a user\'s actions (seconds)')
+    parser.add_argument('--output', default=None, help='save the results as JSON')
+    args = parser.parse_args()
+
+    server_process = None
+    work_dir = None
+    url = args.url
+    if url is None:
+        work_dir = tempfile.mkdtemp(prefix='load-test-')
+        server_process, url = start_server(args.server, get_corpus(scale=args.scale), work_dir)
+
+    try:
+        callback_map = get_callback_map(requests.get(url + dependencies_endpoint, timeout=10).json())
+        results = []
+
+        print(f"{'users':>6} {'sessions':>9} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'mixed':>6}")
+        for users in [int(users) for users in args.concurrency.split(',')]:
+            level = run_level(url, callback_map, users, args.duration, args.think_time)
+            results.append(level)
+            print(f"{level['users']:>6} {level['sessions']:>9} {level['requests']:>9} {level['throughput_rps']:>8.1f} "
+                  f"{level['p50_ms']:>8.1f} {level['p95_ms']:>8.1f} {level['p99_ms']:>8.1f} "
+                  f"{level['error_rate']:>7.1%} {level['state_mixing']:>6}")
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.wait()
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as results_file:
+            json.dump({'url': url, 'server': None if args.url else args.server, 'scale': args.scale, 'levels': results},
+                      results_file, indent=2)
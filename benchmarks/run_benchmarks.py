@@ -0,0 +1,222 @@
+# Callback benchmark suite
+#
+# Times startup and the filter callbacks (update_filter_state, update_dropdown_options, search_piece_movement_options,
+# update_all_notes_graph & update_melodic_graphs) against a synthetic corpus, reporting p50 / p95 latency, response size and peak memory,
+# and saves the results as JSON so two versions can be compared.
+#
+#   python benchmarks/run_benchmarks.py --scale 10
+#   python benchmarks/run_benchmarks.py --scale 10 --compare benchmarks/results/<label>-10x.json
+#
+# Callbacks are posted to /_dash-update-component through the Flask test client with the filter result cache
+# disabled, so every sample pays for the filtering (--filter-cache keeps it on to measure repeated requests).
+# Note stepping on Individual Score Analysis runs in the browser and is not covered here.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from dash_requests import callback_endpoint, find_callback, build_callback_request
+from synthetic_corpus import get_corpus
+
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+repository_dir = os.path.dirname(benchmarks_dir)
+
+# Callbacks under test, by the output they write
+
+benchmark_callbacks = {
+    'update_filter_state': 'filter-state-store.data',
+    'update_dropdown_options': 'composer-dropdown.options',
+    'search_piece_movement_options': 'piece-movement-dropdown.options',
+    'update_all_notes_graph': 'aha-interval-ratio-graph.figure',
+    'update_melodic_graphs': 'melodic-score-store.data',
+}
+
+filter_state_output = 'filter-state-store.data'
+
+filter_dropdowns = {
+    'composers': 'composer-dropdown',
+    'piece_composer_pairs': 'piece-composer-dropdown',
+    'piece_movement_pairs': 'piece-movement-dropdown',
+    'ensembles': 'ensemble-dropdown',
+    'instruments': 'instrument-dropdown',
+    'key_qualities': 'key-quality-dropdown',
+}
+
+startup_probe = '''
+import json, resource, time
+started = time.perf_counter()
+import app
+print(json.dumps({'seconds': time.perf_counter() - started,
+                  'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}))
+'''
+
+def get_label():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=repository_dir, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+# Startup: import app in a fresh process, cold (empty dataset cache & artifacts) then warm
+
+def time_startup(environment):
+    output = subprocess.check_output([sys.executable, '-c', startup_probe], cwd=repository_dir, env=environment, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+# Filter scenarios picked from the corpus: the biggest composers, ensemble, instrument and movement
+
+def get_scenarios(app_module):
+    data = app_module.whole_data_set
+    composers = data['composer'].value_counts().index.tolist()
+    ensemble = data['ensemble'].value_counts().index[0]
+    instrument = data['instrument_name'].value_counts().index[0]
+
+    movement_lengths = {movement_id: stop - start for movement_id, (start, stop) in app_module.movement_partitions.items()}
+    movement_id = max(movement_lengths, key=movement_lengths.get)
+    movement = app_module.movements[app_module.movements['id'] == movement_id].iloc[0]
+    movement_start, _ = app_module.movement_partitions[movement_id]
+    movement_instrument = data['instrument_name'].iloc[movement_start]
+
+    return {
+        'unfiltered': ({}, 1),
+        'one_composer': ({'composers': composers[:1]}, 1),
+        'three_composers': ({'composers': composers[:3]}, 1),
+        'three_composers_harmonic': ({'composers': composers[:3]}, 2),
+        'three_composers_melodic': ({'composers': composers[:3]}, 3),
+        'ensemble_minor': ({'ensembles': [ensemble], 'key_qualities': ['Minor']}, 1),
+        'instrument': ({'instruments': [instrument]}, 1),
+        'movement': ({'piece_movement_pairs': [movement['piece_movement']]}, 1),
+        'movement_instrument': ({'piece_movement_pairs': [movement['piece_movement']], 'instruments': [movement_instrument]}, 1),
+    }
+
+# Callbacks reading the filter stage's store get the state the filter stage writes for the selections
+# (versions without the filter stage read the dropdowns directly)
+
+def get_scenario_values(client, callback_map, selections, radio_value):
+    values = {f'{dropdown}.value': selections.get(name, []) for name, dropdown in filter_dropdowns.items()}
+    values['radio-selector.value'] = radio_value
+
+    if filter_state_output in callback_map:
+        request = build_callback_request(callback_map, filter_state_output, values)
+        values[filter_state_output] = client.post(callback_endpoint, json=request).get_json()['response']['filter-state-store']['data']
+    return values
+
+def post_callback(client, request):
+    response = client.post(callback_endpoint, json=request)
+    if response.status_code not in (200, 204):
+        raise RuntimeError(f"{request['output']} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return len(response.get_data())
+
+def time_callback(client, request, samples):
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        response_bytes = post_callback(client, request)
+        latencies.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    post_callback(client, request)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+        'mean_ms': float(np.mean(latencies) * 1000),
+        'response_bytes': response_bytes,
+        'peak_memory_bytes': peak_bytes,
+    }
+
+def print_results(results):
+    print(f"startup: cold {results['startup']['cold']['seconds']:.2f}s, warm {results['startup']['warm']['seconds']:.2f}s, "
+          f"max RSS {results['startup']['warm']['max_rss_bytes'] / 2 ** 20:.0f} MB")
+    for callback_name, scenarios in results['callbacks'].items():
+        for scenario_name, timing in scenarios.items():
+            print(f"{callback_name:<26} {scenario_name:<26} p50 {timing['p50_ms']:8.2f} ms  p95 {timing['p95_ms']:8.2f} ms  "
+                  f"{timing['response_bytes'] / 1024:9.1f} KB  peak {timing['peak_memory_bytes'] / 2 ** 20:7.1f} MB")
+
+def print_comparison(baseline, results):
+    print(f"\n{baseline['label']} -> {results['label']} (p50, lower is better)")
+    for callback_name, scenarios in results['callbacks'].items():
+        for scenario_name, timing in scenarios.items():
+            baseline_timing = baseline['callbacks'].get(callback_name, {}).get(scenario_name)
+            if baseline_timing is None:
+                continue
+            print(f"{callback_name:<26} {scenario_name:<26} {baseline_timing['p50_ms']:8.2f} -> {timing['p50_ms']:8.2f} ms "
+                  f"({timing['p50_ms'] / baseline_timing['p50_ms']:5.2f}x)")
+    for phase in ['cold', 'warm']:
+        print(f"startup {phase:<37} {baseline['startup'][phase]['seconds']:8.2f} -> {results['startup'][phase]['seconds']:8.2f} s")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the dashboard callbacks on a synthetic corpus')
+    parser.add_argument('--scale', type=float, default=1.0, help='corpus size relative to the real corpus')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--samples', type=int, default=30, help='timed requests per callback & scenario')
+    parser.add_argument('--label', default=None, help='results name (defaults to the git commit)')
+    parser.add_argument('--output-dir', default=os.path.join(benchmarks_dir, 'results'))
+    parser.add_argument('--compare', default=None, help='results JSON of another version to compare against')
+    parser.add_argument('--filter-cache', action='store_true', help='keep the filter result cache enabled')
+    args = parser.parse_args()
+
+    label = args.label or get_label()
+    scale_name = f'{args.scale:g}x'
+
+    corpus_path = get_corpus(scale=args.scale, seed=args.seed)
+
+    work_dir = tempfile.mkdtemp(prefix='benchmark-')
+    os.environ['WHOLE_DATA_SET_ZIP'] = corpus_path
+    os.environ['DATASET_CACHE_DIR'] = os.path.join(work_dir, 'dataset_cache')
+    os.environ['ARTIFACT_DIR'] = os.path.join(work_dir, 'artifacts')
+    if not args.filter_cache:
+        os.environ['FILTER_CACHE_MAX_ENTRIES'] = '0'
+
+    startup = {'cold': time_startup(os.environ.copy()), 'warm': time_startup(os.environ.copy())}
+
+    os.chdir(repository_dir)
+    sys.path.insert(0, repository_dir)
+    import app as app_module
+
+    client = app_module.app.server.test_client()
+    scenarios = get_scenarios(app_module)
+    callback_timings = {}
+
+    for callback_name, output in benchmark_callbacks.items():
+        try:
+            output_key = find_callback(app_module.app.callback_map, output)
+        except KeyError:
+            continue
+        callback_timings[callback_name] = {}
+        for scenario_name, (selections, radio_value) in scenarios.items():
+            values = get_scenario_values(client, app_module.app.callback_map, selections, radio_value)
+            request = build_callback_request(app_module.app.callback_map, output_key, values, triggered=['composer-dropdown.value'])
+            callback_timings[callback_name][scenario_name] = time_callback(client, request, args.samples)
+
+    results = {
+        'label': label,
+        'scale': args.scale,
+        'seed': args.seed,
+        'notes': len(app_module.whole_data_set),
+        'samples': args.samples,
+        'filter_cache': args.filter_cache,
+        'startup': startup,
+        'callbacks': callback_timings,
+    }
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    results_path = os.path.join(args.output_dir, f'{label}-{scale_name}.json')
+    with open(results_path, 'w') as results_file:
+        json.dump(results, results_file, indent=2)
+
+    print_results(results)
+    print(f'Saved {results_path}')
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            print_comparison(json.load(baseline_file), results)
@@ -0,0 +1,219 @@
+# Synthetic MusicNet-shaped corpus
+#
+# Writes a whole_data_set.zip with the dashboard's note table schema at a chosen scale of the real corpus
+# (1 = ~330 movements / ~1M notes). Composers, ensembles and years follow MusicNet, intervals lean towards
+# the notes of the key so the Diatonic v. Borrowed ratios look like real pieces.
+#
+#   python benchmarks/synthetic_corpus.py --scale 10 --output benchmarks/.corpus/whole_data_set-10x.zip
+
+import argparse
+import io
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+
+# Corpus shape
+
+real_corpus_movements = 330
+
+composer_weights = {
+    'Beethoven': 157, 'Bach': 67, 'Schubert': 30, 'Mozart': 24, 'Brahms': 24,
+    'Cambini': 9, 'Dvorak': 8, 'Faure': 4, 'Ravel': 4, 'Haydn': 3,
+}
+
+composer_years = {
+    'Beethoven': (1795, 1827), 'Bach': (1705, 1750), 'Schubert': (1813, 1828), 'Mozart': (1770, 1791),
+    'Brahms': (1853, 1896), 'Cambini': (1770, 1800), 'Dvorak': (1870, 1904), 'Faure': (1876, 1924),
+    'Ravel': (1902, 1928), 'Haydn': (1772, 1803),
+}
+
+composer_ensembles = {
+    'Beethoven': ['Solo Piano', 'String Quartet', 'Accompanied Violin', 'Accompanied Cello', 'Piano Trio', 'Wind Octet'],
+    'Bach': ['Solo Piano', 'Solo Cello', 'Solo Violin', 'Accompanied Violin'],
+    'Schubert': ['Solo Piano', 'String Quartet', 'Piano Trio', 'Piano Quintet'],
+    'Mozart': ['Solo Piano', 'String Quartet', 'Accompanied Violin', 'Clarinet Quintet', 'Piano Quartet'],
+    'Brahms': ['Solo Piano', 'Piano Quartet', 'Clarinet Quintet', 'Horn Piano Trio', 'String Sextet'],
+    'Cambini': ['Wind Quintet'],
+    'Dvorak': ['String Quartet', 'Piano Quintet'],
+    'Faure': ['Piano Quartet'],
+    'Ravel': ['String Quartet', 'Piano Trio'],
+    'Haydn': ['String Quartet'],
+}
+
+ensemble_instruments = {
+    'Solo Piano': ['Piano'],
+    'Solo Cello': ['Cello'],
+    'Solo Violin': ['Violin'],
+    'Accompanied Violin': ['Piano', 'Violin'],
+    'Accompanied Cello': ['Piano', 'Cello'],
+    'String Quartet': ['Violin', 'Viola', 'Cello'],
+    'String Sextet': ['Violin', 'Viola', 'Cello'],
+    'Piano Trio': ['Piano', 'Violin', 'Cello'],
+    'Piano Quartet': ['Piano', 'Violin', 'Viola', 'Cello'],
+    'Piano Quintet': ['Piano', 'Violin', 'Viola', 'Cello', 'Contrabass'],
+    'Clarinet Quintet': ['Clarinet', 'Violin', 'Viola', 'Cello'],
+    'Horn Piano Trio': ['Piano', 'Violin', 'Horn'],
+    'Wind Quintet': ['Flute', 'Oboe', 'Clarinet', 'Bassoon', 'Horn'],
+    'Wind Octet': ['Oboe', 'Clarinet', 'Bassoon', 'Horn'],
+}
+
+ensemble_forms = {
+    'Solo Piano': 'Piano Sonata',
+    'Solo Cello': 'Cello Suite',
+    'Solo Violin': 'Violin Partita',
+    'Accompanied Violin': 'Violin Sonata',
+    'Accompanied Cello': 'Cello Sonata',
+    'Wind Octet': 'Octet',
+    'Horn Piano Trio': 'Horn Trio',
+}
+
+tempos = ['Allegro', 'Adagio', 'Menuetto', 'Andante', 'Scherzo', 'Presto', 'Largo', 'Rondo']
+
+note_names = ['C', 'C#/Db', 'D', 'D#/Eb', 'E', 'F', 'F#/Gb', 'G', 'G#/Ab', 'A', 'A#/Bb', 'B']
+
+# Intervals against the key center, in semitones (0 is the Root)
+
+interval_names = ['Root', 'Minor Second', 'Major Second', 'Minor Third', 'Major Third', 'Perfect Fourth', 'Tritone',
+                  'Perfect Fifth', 'Minor Sixth', 'Major Sixth', 'Minor Seventh', 'Major Seventh']
+
+key_quality_intervals = {
+    'Major': [0, 2, 4, 5, 7, 9, 11],
+    'Minor': [0, 2, 3, 5, 7, 8, 10],
+}
+
+note_table_columns = [
+    'composer', 'composition', 'movement', 'id', 'instrument_name', 'ensemble', 'key_center', 'key_quality',
+    'note_name', 'note_interval', 'note_status', 'melodic_index', 'note_is_harmonic', 'restored_indexed_note_is_melodic',
+    'decade', 'composition_year',
+]
+
+# Interval weights of a key quality: diatonic intervals (the root and fifth most of all) ~90% of notes
+
+def get_interval_weights(key_quality):
+    weights = np.full(12, 0.1 / 5)
+    weights[key_quality_intervals[key_quality]] = 0.9 / 7
+    weights[[0, 7]] *= 1.5
+    return weights / weights.sum()
+
+# Movements: one row per movement, grouped into pieces of 1 - 4 movements
+
+def generate_movements(scale, rng):
+    movements = []
+    weight_total = sum(composer_weights.values())
+
+    for composer, weight in composer_weights.items():
+        composer_movements = max(1, round(real_corpus_movements * scale * weight / weight_total))
+        piece_numbers = {}
+
+        while composer_movements > 0:
+            ensemble = rng.choice(composer_ensembles[composer])
+            form = ensemble_forms.get(ensemble, ensemble)
+            piece_numbers[form] = piece_numbers.get(form, 0) + 1
+            key_center = int(rng.integers(12))
+            key_quality = 'Major' if rng.random() < 0.6 else 'Minor'
+            composition_year = int(rng.integers(*composer_years[composer], endpoint=True))
+            composition = f'{form} No. {piece_numbers[form]} in {note_names[key_center]} {key_quality.lower()}'
+
+            for movement_number in range(1, min(int(rng.integers(1, 5)), composer_movements) + 1):
+                movements.append({
+                    'composer': composer,
+                    'composition': composition,
+                    'movement': f'{movement_number}. {tempos[int(rng.integers(len(tempos)))]}',
+                    'ensemble': ensemble,
+                    'key_center': key_center,
+                    'key_quality': key_quality,
+                    'decade': f'{composition_year // 10 * 10}s',
+                    'composition_year': composition_year,
+                })
+                composer_movements -= 1
+
+    movements = pd.DataFrame(movements)
+    movements['id'] = 1727 + rng.permutation(len(movements) * 3)[:len(movements)]
+    return movements
+
+# Notes of one movement: onsets (melodic indexes) of 1 - 4 simultaneous notes spread over the ensemble
+
+def generate_movement_notes(movement, rng):
+    instruments = ensemble_instruments[movement['ensemble']]
+    onset_count = int(np.clip(rng.lognormal(np.log(1500), 0.6), 100, 20000))
+
+    max_onset_size = min(4, len(instruments) + 1)
+    onset_size_weights = np.array([0.55, 0.25, 0.12, 0.08][:max_onset_size])
+    onset_sizes = rng.choice(np.arange(1, max_onset_size + 1), size=onset_count, p=onset_size_weights / onset_size_weights.sum())
+    note_count = int(onset_sizes.sum())
+    onset_offsets = np.concatenate([[0], np.cumsum(onset_sizes)[:-1]])
+
+    intervals = rng.choice(12, size=note_count, p=get_interval_weights(movement['key_quality']))
+    diatonic = np.isin(intervals, key_quality_intervals[movement['key_quality']])
+    melodic = np.zeros(note_count, dtype=bool)
+    melodic[onset_offsets] = True
+
+    return {
+        'composer': np.full(note_count, movement['composer'], dtype=object),
+        'composition': np.full(note_count, movement['composition'], dtype=object),
+        'movement': np.full(note_count, movement['movement'], dtype=object),
+        'id': np.full(note_count, movement['id']),
+        'instrument_name': np.array(instruments, dtype=object)[rng.integers(len(instruments), size=note_count)],
+        'ensemble': np.full(note_count, movement['ensemble'], dtype=object),
+        'key_center': np.full(note_count, note_names[movement['key_center']], dtype=object),
+        'key_quality': np.full(note_count, movement['key_quality'], dtype=object),
+        'note_name': np.array(note_names, dtype=object)[(movement['key_center'] + intervals) % 12],
+        'note_interval': np.array(interval_names, dtype=object)[intervals],
+        'note_status': np.where(diatonic, 'Diatonic', 'Borrowed').astype(object),
+        'melodic_index': np.repeat(np.arange(1, onset_count + 1), onset_sizes),
+        'note_is_harmonic': np.repeat(onset_sizes > 1, onset_sizes),
+        'restored_indexed_note_is_melodic': melodic,
+        'decade': np.full(note_count, movement['decade'], dtype=object),
+        'composition_year': np.full(note_count, movement['composition_year']),
+    }
+
+# Write the corpus as whole_data_set.csv inside a zip, a chunk of movements at a time so large scales stream
+# (movements are written in random id order, like an unsorted export)
+
+def write_corpus(zip_filename, scale=1.0, seed=0, movements_per_chunk=50):
+    rng = np.random.default_rng(seed)
+    movements = generate_movements(scale, rng)
+    movements = movements.iloc[rng.permutation(len(movements))].reset_index(drop=True)
+    note_count = 0
+
+    os.makedirs(os.path.dirname(zip_filename) or '.', exist_ok=True)
+    temp_filename = f'{zip_filename}.{os.getpid()}.tmp'
+
+    with zipfile.ZipFile(temp_filename, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        with zip_file.open('whole_data_set.csv', 'w', force_zip64=True) as csv_file:
+            csv_text = io.TextIOWrapper(csv_file, encoding='utf-8', newline='')
+
+            for chunk_start in range(0, len(movements), movements_per_chunk):
+                chunk_notes = [generate_movement_notes(movement, rng)
+                               for movement in movements.iloc[chunk_start:chunk_start + movements_per_chunk].to_dict('records')]
+                chunk = pd.DataFrame({column: np.concatenate([notes[column] for notes in chunk_notes]) for column in note_table_columns})
+                chunk.to_csv(csv_text, index=False, header=chunk_start == 0)
+                note_count += len(chunk)
+
+            csv_text.flush()
+            csv_text.detach()
+
+    os.replace(temp_filename, zip_filename)
+    return len(movements), note_count
+
+# Corpus of a scale & seed under benchmarks/.corpus, generated on first use
+
+def get_corpus(scale=1.0, seed=0):
+    corpus_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.corpus', f'whole_data_set-{scale:g}x-seed{seed}.zip')
+    if not os.path.exists(corpus_path):
+        movement_count, note_count = write_corpus(corpus_path, scale=scale, seed=seed)
+        print(f'Generated {corpus_path}: {movement_count:,} movements, {note_count:,} notes')
+    return corpus_path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a synthetic MusicNet-shaped whole_data_set.zip')
+    parser.add_argument('--scale', type=float, default=1.0, help='size relative to the real corpus (1, 10, 100, ...)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='whole_data_set.zip')
+    args = parser.parse_args()
+
+    movement_count, note_count = write_corpus(args.output, scale=args.scale, seed=args.seed)
+    print(f'Wrote {args.output}: {movement_count:,} movements, {note_count:,} notes')
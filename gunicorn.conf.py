@@ -0,0 +1,19 @@
+# Gunicorn settings, overridable from the environment
+
+import os
+import multiprocessing
+
+bind = os.environ.get('BIND', '0.0.0.0:8050')
+
+# Worker processes handle callbacks in parallel, threads keep each worker busy while responses are sent
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+# Load the app (dataset, filter index & figures) before forking the workers
+
+preload_app = True
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', None)
@@ -0,0 +1,77 @@
+# Test fixtures
+#
+# The app is imported once, on a tiny synthetic corpus (benchmarks/synthetic_corpus.py) with its dataset cache and
+# artifacts in a temporary directory, and the tests compare its structures with plain pandas on the same notes.
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+
+repository_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(repository_dir, 'benchmarks'))
+
+from synthetic_corpus import write_corpus
+
+
+@pytest.fixture(scope='session')
+def work_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp('app')
+
+@pytest.fixture(scope='session')
+def app(work_dir):
+    corpus_path = str(work_dir / 'whole_data_set.zip')
+    write_corpus(corpus_path, scale=0.05, seed=0)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('WHOLE_DATA_SET_ZIP', corpus_path)
+        monkeypatch.setenv('DATASET_CACHE_DIR', str(work_dir / 'dataset_cache'))
+        monkeypatch.setenv('ARTIFACT_DIR', str(work_dir / 'artifacts'))
+        monkeypatch.setenv('MEMORY_REPORT', '0')
+        monkeypatch.chdir(repository_dir)
+        monkeypatch.syspath_prepend(repository_dir)
+        import app
+    return app
+
+# Filter combinations (filter_rows arguments) built from the corpus's most common values, each with the pandas
+# isin mask of the notes it selects
+
+selection_columns = {
+    'selected_composers': 'composer',
+    'selected_piece_composer_pairs': 'piece_composer',
+    'selected_piece_movement_pairs': 'piece_movement',
+    'selected_ensembles': 'ensemble',
+    'selected_instruments': 'instrument_name',
+    'selected_key_quality': 'key_quality',
+}
+
+def get_common_values(data, column, count):
+    return data[column].value_counts().index[:count].tolist()
+
+def get_selection_mask(data, selection):
+    mask = np.ones(len(data), dtype=bool)
+    for argument, column in selection_columns.items():
+        if selection.get(argument):
+            mask &= data[column].isin(selection[argument]).to_numpy()
+
+    if selection.get('radio_value') == 2:
+        mask &= data['note_is_harmonic'].to_numpy(dtype=bool)
+    elif selection.get('radio_value') == 3:
+        mask &= data['restored_indexed_note_is_melodic'].to_numpy(dtype=bool)
+    return mask
+
+@pytest.fixture(scope='session')
+def selections(app):
+    data = app.whole_data_set
+    selections = [
+        {'selected_composers': get_common_values(data, 'composer', 1)},
+        {'selected_composers': get_common_values(data, 'composer', 2), 'selected_ensembles': get_common_values(data, 'ensemble', 3)},
+        {'selected_instruments': get_common_values(data, 'instrument_name', 2),
+         'selected_key_quality': get_common_values(data, 'key_quality', 1), 'radio_value': 2},
+        {'selected_piece_movement_pairs': get_common_values(data, 'piece_movement', 3), 'radio_value': 3},
+        {'selected_piece_composer_pairs': get_common_values(data, 'piece_composer', 1), 'selected_ensembles': ['No Such Ensemble']},
+        {'radio_value': 2},
+    ]
+    return [(selection, get_selection_mask(data, selection)) for selection in selections]
@@ -0,0 +1,103 @@
+# Request coalescing: concurrent identical computations share one result, and a request superseded by a newer request
+# from the same page for the same callback is dropped
+
+import threading
+import time
+
+import pytest
+from dash.exceptions import PreventUpdate
+from dash_requests import callback_endpoint, find_callback, build_callback_request
+
+
+def run_concurrently(call_count, call):
+    results = [None] * call_count
+    barrier = threading.Barrier(call_count)
+
+    def run(position):
+        barrier.wait()
+        try:
+            results[position] = call()
+        except Exception as error:
+            results[position] = error
+
+    threads = [threading.Thread(target=run, args=(position,)) for position in range(call_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+# Single flight
+
+def test_single_flight_computes_once(app):
+    single_flight = app.SingleFlight()
+    computations = []
+
+    def compute():
+        computations.append(1)
+        time.sleep(0.2)
+        return 'result'
+
+    results = run_concurrently(8, lambda: single_flight.do('key', compute))
+
+    assert results == ['result'] * 8
+    assert len(computations) == 1
+    assert single_flight.coalesced == 7
+    assert single_flight.calls == {}
+
+def test_single_flight_shares_errors(app):
+    single_flight = app.SingleFlight()
+
+    def compute():
+        time.sleep(0.2)
+        raise ValueError('failed')
+
+    results = run_concurrently(4, lambda: single_flight.do('key', compute))
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.do('key', lambda: 'recomputed') == 'recomputed'
+
+def test_identical_callback_calls_are_coalesced(app, monkeypatch):
+    monkeypatch.setattr(app, 'callback_single_flight', app.SingleFlight())
+    computations = []
+
+    @app.coalesce_callback
+    def callback(value):
+        computations.append(value)
+        time.sleep(0.2)
+        return value * 2
+
+    assert run_concurrently(4, lambda: callback(21)) == [42] * 4
+    assert computations == [21]
+
+# Superseded requests
+
+def post_filter_state(app, client, composers, session, sequence):
+    output_key = find_callback(app.app.callback_map, 'filter-state-store.data')
+    body = build_callback_request(app.app.callback_map, output_key, {'composer-dropdown.value': composers})
+    body.update(session=session, sequence=sequence)
+    return client.post(callback_endpoint, json=body)
+
+def test_superseded_request_is_dropped(app):
+    client = app.app.server.test_client()
+    superseded = app.request_sequences.superseded
+
+    assert post_filter_state(app, client, ['Bach'], 'page-1', 2).status_code == 200
+    assert post_filter_state(app, client, ['Mozart'], 'page-1', 1).status_code == 204
+    assert post_filter_state(app, client, ['Mozart'], 'page-2', 1).status_code == 200
+    assert app.request_sequences.superseded == superseded + 1
+
+def test_request_superseded_while_computing(app):
+
+    @app.coalesce_callback
+    def callback(value):
+        # A newer request from the same page arrives while this one computes
+        app.request_sequences.start(('page-3', 'callback'), 2)
+        return value
+
+    with app.app.server.test_request_context(json={'session': 'page-3', 'sequence': 1}):
+        with pytest.raises(PreventUpdate):
+            callback('value')
+
+    with app.app.server.test_request_context(json={'session': 'page-3', 'sequence': 3}):
+        assert callback('value') == 'value'
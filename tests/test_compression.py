@@ -0,0 +1,70 @@
+# Response compression & static caching: gzip for clients that accept it, a weak ETag for the gzipped body, and a
+# year of immutable caching for fingerprinted component bundles & assets
+
+import gzip
+import re
+
+
+def get_bundle_urls(client):
+    page = client.get('/').get_data(as_text=True)
+    return re.findall(r'src="([^"]*/_dash-component-suites/[^"]*)"', page)
+
+def get_asset_url(client, asset):
+    page = client.get('/').get_data(as_text=True)
+    return re.search(rf'src="([^"]*/assets/{re.escape(asset)}\?m=[^"]*)"', page).group(1)
+
+def test_fingerprinted_bundles_are_gzipped_and_immutable(app):
+    client = app.app.server.test_client()
+    bundle_url = get_bundle_urls(client)[0]
+
+    plain = client.get(bundle_url)
+    gzipped = client.get(bundle_url, headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert 'Content-Encoding' not in plain.headers
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gzipped.get_data()) == plain.get_data()
+    assert 'Accept-Encoding' in gzipped.headers['Vary']
+    assert gzipped.cache_control.immutable and gzipped.cache_control.max_age == 31536000
+
+def test_gzipped_assets_have_a_weak_etag(app):
+    client = app.app.server.test_client()
+    asset_url = get_asset_url(client, 'score_stepping.js')
+
+    plain = client.get(asset_url)
+    gzipped = client.get(asset_url, headers={'Accept-Encoding': 'gzip'})
+
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gzipped.get_data()) == plain.get_data()
+    assert not plain.headers['ETag'].startswith('W/')
+    assert gzipped.headers['ETag'] == 'W/' + plain.headers['ETag']
+    assert gzipped.cache_control.immutable and gzipped.cache_control.max_age == 31536000
+
+    not_modified = client.get(asset_url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']})
+    assert not_modified.status_code == 304
+
+def test_gzip_refused_by_quality(app):
+    client = app.app.server.test_client()
+    bundle_url = get_bundle_urls(client)[0]
+
+    for accept_encoding in ['gzip;q=0', 'identity, gzip;q=0', 'br', '*;q=0']:
+        response = client.get(bundle_url, headers={'Accept-Encoding': accept_encoding})
+        assert 'Content-Encoding' not in response.headers, accept_encoding
+
+def test_small_responses_are_not_gzipped(app, monkeypatch):
+    monkeypatch.setattr(app, 'compress_min_bytes', 10 ** 9)
+    client = app.app.server.test_client()
+
+    response = client.get(get_bundle_urls(client)[0], headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+
+def test_gzipped_static_responses_are_bounded(app, monkeypatch):
+    monkeypatch.setattr(app, 'compressed_static_max_entries', 2)
+    monkeypatch.setattr(app, 'compressed_static_responses', app.OrderedDict())
+    client = app.app.server.test_client()
+    bundle_urls = get_bundle_urls(client)[:4]
+
+    for bundle_url in bundle_urls:
+        client.get(f'{bundle_url}?unrelated=1', headers={'Accept-Encoding': 'gzip'})
+
+    assert list(app.compressed_static_responses) == [(bundle_url, None, None) for bundle_url in bundle_urls[2:]]
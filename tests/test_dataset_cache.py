@@ -0,0 +1,74 @@
+# Dataset cache: the csv cached as Parquet under the zip's fingerprint, and the stale caches removed once a cache is
+# written
+
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+
+def write_cache_files(cache_dir, names):
+    for modified_time, name in enumerate(names):
+        cache_path = cache_dir / name
+        if name.endswith('.shared'):
+            cache_path.mkdir()
+            (cache_path / 'layout.json').write_text('{}')
+        else:
+            cache_path.write_text('')
+        os.utime(cache_path, (1000 + modified_time, 1000 + modified_time))
+
+@pytest.mark.parametrize('cache_fingerprints, kept', [
+    (2, ['whole_data_set-bbb-v4.parquet', 'whole_data_set-ddd-v4.parquet']),
+    (1, ['whole_data_set-ddd-v4.parquet']),
+])
+def test_stale_caches_are_removed(app, monkeypatch, tmp_path, cache_fingerprints, kept):
+    monkeypatch.setattr(app, 'dataset_cache_fingerprints', cache_fingerprints)
+    write_cache_files(tmp_path, [
+        'whole_data_set-ccc-v4.parquet',
+        'whole_data_set-ddd-v3.parquet',
+        'whole_data_set-bbb-v3.parquet',
+        'whole_data_set-bbb-v4.parquet',
+        'whole_data_set-eee-v5.parquet',
+        'whole_data_set-ddd-v4.parquet',
+        'whole_data_set-ccc-v4.shared',
+        'whole_data_set-ddd-v4.parquet.123.tmp',
+        'movements-ccc-v4.parquet',
+        'whole_data_set-extra-ccc-v4.parquet',
+    ])
+
+    app.remove_stale_caches(str(tmp_path / 'whole_data_set-ddd-v4.parquet'))
+
+    assert sorted(os.listdir(tmp_path)) == sorted(kept + ['whole_data_set-ccc-v4.shared', 'whole_data_set-ddd-v4.parquet.123.tmp',
+                                                          'movements-ccc-v4.parquet', 'whole_data_set-extra-ccc-v4.parquet'])
+
+def test_stale_shared_datasets_are_removed(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'dataset_cache_fingerprints', 1)
+    write_cache_files(tmp_path, ['whole_data_set-ccc-v4.shared', 'whole_data_set-ddd-v4.shared', 'whole_data_set-ddd-v4.parquet'])
+
+    app.remove_stale_caches(str(tmp_path / 'whole_data_set-ddd-v4.shared'))
+
+    assert sorted(os.listdir(tmp_path)) == ['whole_data_set-ddd-v4.parquet', 'whole_data_set-ddd-v4.shared']
+
+def write_zip(zip_path, data):
+    with zipfile.ZipFile(zip_path, 'w') as zip_file:
+        zip_file.writestr('notes.csv', data.to_csv(index=False))
+
+def test_csv_cached_by_zip_fingerprint(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'dataset_cache_dir', str(tmp_path / 'cache'))
+    monkeypatch.setattr(app, 'dataset_cache_fingerprints', 1)
+    zip_path = str(tmp_path / 'notes.zip')
+    data = pd.DataFrame({'id': [2, 1, 1], 'note_name': ['C', 'D', 'E']})
+
+    write_zip(zip_path, data)
+    first_fingerprint = app.get_zip_fingerprint(zip_path, 'notes.csv')
+    pd.testing.assert_frame_equal(app.read_csv_from_cache(zip_path, 'notes.csv', ['id', 'note_name']), data)
+    pd.testing.assert_frame_equal(app.read_csv_from_cache(zip_path, 'notes.csv', ['note_name']), data[['note_name']])
+    assert os.listdir(app.dataset_cache_dir) == [f'notes-{first_fingerprint}-v{app.dataset_cache_version}.parquet']
+
+    changed_data = data.assign(note_name=['F', 'G', 'A'])
+    write_zip(zip_path, changed_data)
+    second_fingerprint = app.get_zip_fingerprint(zip_path, 'notes.csv')
+    assert second_fingerprint != first_fingerprint
+    pd.testing.assert_frame_equal(app.read_csv_from_cache(zip_path, 'notes.csv', ['id', 'note_name']), changed_data)
+    assert os.listdir(app.dataset_cache_dir) == [f'notes-{second_fingerprint}-v{app.dataset_cache_version}.parquet']
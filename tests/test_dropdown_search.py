@@ -0,0 +1,47 @@
+# Dropdown search: the server-side search of the Pieces & Movements dropdowns against a brute force substring search,
+# and the option labels the Dropdown component searches itself
+
+import numpy as np
+from dash.development.base_component import Component
+
+
+def search_labels(labels, query):
+    return np.array([code for code, label in enumerate(labels)
+                     if all(any(query_token in token for token in str(label).lower().split()) for query_token in query.lower().split())],
+                    dtype=np.int32)
+
+def test_dropdown_search_matches_substrings(app):
+    for column, search_index in app.dropdown_search_indexes.items():
+        labels = app.column_categories[column]
+        first_label_tokens = str(labels[0]).lower().split()
+        queries = ['no', 'ON', 'sonata', ' major ', first_label_tokens[0][1:], ' '.join(token[:2] for token in first_label_tokens),
+                   'no such option']
+
+        for query in queries:
+            np.testing.assert_array_equal(search_index.search(query), search_labels(labels, query), err_msg=f'{column}: {query!r}')
+
+def test_dropdown_search_without_query_tokens(app):
+    assert app.DropdownSearchIndex(['Sonata No. 1 - Allegro']).search('   ') is None
+
+def test_searched_options_have_the_most_notes_first(app, monkeypatch):
+    monkeypatch.setattr(app, 'dropdown_search_limit', 3)
+    data = app.whole_data_set
+    labels = app.column_categories['piece_movement']
+    matches = set(labels[search_labels(labels, 'sonata')])
+    note_counts = data['piece_movement'].value_counts()
+    expected_values = sorted([value for value in data['piece_movement'].unique() if value in matches], key=lambda value: -note_counts[value])
+
+    options = app.search_dropdown_options('piece_movement', None, 'sonata', [expected_values[-1]])
+
+    assert [option['value'] for option in options] == expected_values[:3] + expected_values[-1:]
+
+def test_dropdown_options_search_the_value_not_the_count(app):
+    option_codes, option_note_counts = app.get_faceted_options(None, 'composer')
+
+    options = app.get_dropdown_options('composer', option_codes, option_note_counts)
+
+    for option, note_count in zip(options, option_note_counts.tolist()):
+        assert option['search'] == option['value']
+        assert isinstance(option['label'], Component)
+        value, count_label = option['label'].children
+        assert value == option['value'] and count_label.children == f' ({note_count:,})'
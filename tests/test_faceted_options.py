@@ -0,0 +1,25 @@
+# Faceted filter options: each dropdown's options with their note counts for the current filters, against pandas
+# value_counts of the filtered notes
+
+import pandas as pd
+
+
+def test_faceted_options_match_value_counts(app, selections):
+    data = app.whole_data_set
+
+    for selection, mask in selections:
+        cells = app.filter_rows(**selection, filter_index=app.interval_cube_filter_index)
+
+        for column in app.filter_option_columns:
+            option_codes, option_note_counts = app.get_faceted_options(cells, column)
+            options = pd.Series(option_note_counts, index=app.column_categories[column][option_codes].tolist())
+            expected_options = data.loc[mask, column].value_counts()
+            expected_options = expected_options[expected_options > 0]
+            expected_options.index = expected_options.index.tolist()
+            pd.testing.assert_series_equal(options.sort_index(), expected_options.sort_index(), check_names=False, check_dtype=False,
+                                           obj=f'{selection}: {column}')
+
+def test_faceted_options_in_order_of_appearance(app):
+    option_codes, _ = app.get_faceted_options(None, 'composer')
+
+    assert app.column_categories['composer'][option_codes].tolist() == app.whole_data_set['composer'].unique().tolist()
@@ -0,0 +1,19 @@
+# Filter index: filter_rows against pandas isin masks
+
+import numpy as np
+
+
+def test_filter_rows_matches_isin(app, selections):
+    for selection, mask in selections:
+        np.testing.assert_array_equal(app.filter_rows(**selection), np.flatnonzero(mask), err_msg=str(selection))
+
+def test_filter_rows_without_filters(app):
+    assert app.filter_rows() is None
+
+def test_filter_index_covers_every_row(app):
+    for column, rows_by_value in app.filter_index.items():
+        rows = np.sort(np.concatenate(list(rows_by_value.values())))
+        if column in ['note_is_harmonic', 'restored_indexed_note_is_melodic']:
+            np.testing.assert_array_equal(rows_by_value[True], np.flatnonzero(app.whole_data_set[column].to_numpy(dtype=bool)))
+        else:
+            np.testing.assert_array_equal(rows, np.flatnonzero(app.whole_data_set[column].notna().to_numpy()), err_msg=column)
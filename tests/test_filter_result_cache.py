@@ -0,0 +1,40 @@
+# Filter result cache: least recently used eviction by entries and bytes, and its size accounting
+
+import numpy as np
+import pytest
+
+
+def test_filter_result_cache_evicts_least_recently_used(app):
+    cache = app.FilterResultCache(max_entries=2, max_bytes=1024)
+    values = {key: np.arange(10 * (position + 1), dtype=np.int32) for position, key in enumerate('abc')}
+
+    cache.get_or_compute('a', lambda: values['a'])
+    cache.get_or_compute('b', lambda: values['b'])
+    cache.get_or_compute('a', lambda: pytest.fail('a is cached'))
+    cache.get_or_compute('c', lambda: values['c'])
+
+    assert list(cache.entries) == ['a', 'c']
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 3, 1)
+    assert stats['size_bytes'] == values['a'].nbytes + values['c'].nbytes
+
+def test_filter_result_cache_bounds_bytes(app):
+    cache = app.FilterResultCache(max_entries=10, max_bytes=1000)
+
+    for key in range(5):
+        cache.get_or_compute(key, lambda: np.zeros(100, dtype=np.int32))
+    cache.get_or_compute('nothing filtered', lambda: None)
+
+    assert list(cache.entries) == [3, 4, 'nothing filtered']
+    assert cache.size_bytes == sum(app.get_result_size(value) for value in cache.entries.values()) == 800
+    assert not cache.entries[4].flags.writeable
+
+def test_filtered_rows_are_cached_by_normalized_selections(app, selections):
+    selection, mask = selections[1]
+    composers = selection['selected_composers']
+
+    rows = app.get_filtered_rows('notes', selected_composers=composers, selected_ensembles=selection['selected_ensembles'])
+    same_rows = app.get_filtered_rows('notes', selected_composers=composers[::-1], selected_ensembles=selection['selected_ensembles'])
+
+    assert same_rows is rows
+    np.testing.assert_array_equal(rows, np.flatnonzero(mask))
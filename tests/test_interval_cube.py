@@ -0,0 +1,33 @@
+# Interval count cube: cell sums against pandas value_counts of the filtered notes
+
+import numpy as np
+
+
+def get_interval_counts(app, notes):
+    return notes['note_interval'].value_counts().reindex(app.note_interval_labels, fill_value=0).to_numpy()
+
+def test_interval_cube_matches_value_counts(app, selections):
+    data = app.whole_data_set
+
+    for selection, mask in selections:
+        cells = app.filter_rows(**selection, filter_index=app.interval_cube_filter_index)
+
+        np.testing.assert_array_equal(app.interval_cube_interval_counts[cells].sum(axis=0), get_interval_counts(app, data[mask]),
+                                      err_msg=str(selection))
+        assert app.interval_cube_note_counts[cells].sum() == mask.sum()
+
+def test_interval_cube_covers_every_note(app):
+    np.testing.assert_array_equal(app.interval_cube_interval_counts.sum(axis=0), get_interval_counts(app, app.whole_data_set))
+    assert app.interval_cube_note_counts.sum() == len(app.whole_data_set)
+
+def test_interval_cube_keeps_missing_dimension_values(app):
+    data = app.whole_data_set.copy()
+    data.loc[:49, 'ensemble'] = None
+    data.loc[100:119, 'instrument_name'] = None
+
+    cube, cube_interval_counts, cube_note_counts = app.build_interval_cube(data)
+
+    assert cube_note_counts.sum() == len(data)
+    missing_ensemble = cube['ensemble'].isna().to_numpy()
+    assert cube_note_counts[missing_ensemble].sum() == 50
+    np.testing.assert_array_equal(cube_interval_counts[missing_ensemble].sum(axis=0), get_interval_counts(app, data[:50]))
@@ -0,0 +1,40 @@
+# Introduction artifacts: built from the note table, saved to ARTIFACT_DIR on the first start and read back after
+
+import json
+import os
+import subprocess
+import sys
+
+
+repository_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_introduction_artifacts_match_note_table(app):
+    data = app.whole_data_set
+    artifacts = app.build_introduction_artifacts(data)
+
+    assert artifacts['count_of_composers'] == data['composer'].nunique()
+    assert artifacts['count_of_pieces'] == data['composition'].nunique()
+    assert artifacts['count_of_movements'] == data['id'].nunique()
+    assert artifacts['formatted_count_of_notes'] == f'{len(data):,}'
+    assert artifacts['filter_options'][0] == data['composer'].unique().tolist()
+
+def test_introduction_artifacts_saved_on_first_start(app, work_dir):
+    assert os.path.dirname(app.introduction_artifacts_path) == str(work_dir / 'artifacts')
+    assert app.read_introduction_artifacts(app.introduction_artifacts_path) == json.loads(json.dumps(app.introduction_artifacts))
+
+def test_introduction_artifacts_not_built(app, tmp_path):
+    assert app.read_introduction_artifacts(str(tmp_path / 'introduction-missing-v1.json')) is None
+
+def test_build_artifacts_command_rebuilds(app, tmp_path):
+    artifacts_path = os.path.join(str(tmp_path), os.path.basename(app.introduction_artifacts_path))
+    with open(artifacts_path, 'w') as artifacts_file:
+        json.dump({'stale': True}, artifacts_file)
+
+    environment = dict(os.environ, WHOLE_DATA_SET_ZIP=app.whole_data_set_zip, DATASET_CACHE_DIR=app.dataset_cache_dir,
+                       ARTIFACT_DIR=str(tmp_path), MEMORY_REPORT='0')
+    completed = subprocess.run([sys.executable, 'app.py', 'build-artifacts'], cwd=repository_dir, env=environment,
+                               capture_output=True, text=True, check=True)
+
+    assert completed.stdout.strip() == f'Wrote {artifacts_path}'
+    assert app.read_introduction_artifacts(artifacts_path) == app.read_introduction_artifacts(app.introduction_artifacts_path)
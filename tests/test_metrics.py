@@ -0,0 +1,74 @@
+# Callback metrics: the histograms /metrics serves for callback requests posted like the browser posts them
+
+import json
+
+from dash_requests import callback_endpoint, find_callback, build_callback_request
+
+
+def get_metric(client, sample):
+    for line in client.get('/metrics').get_data(as_text=True).splitlines():
+        if line.startswith(sample + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+def post_filter_state(app, client, composers, ensembles):
+    output_key = find_callback(app.app.callback_map, 'filter-state-store.data')
+    body = build_callback_request(app.app.callback_map, output_key, {'composer-dropdown.value': composers, 'ensemble-dropdown.value': ensembles},
+                                  triggered=['composer-dropdown.value'])
+    response = client.post(callback_endpoint, json=body)
+    assert response.status_code == 200
+
+def test_callback_metrics(app, selections):
+    client = app.app.server.test_client()
+    selection, _ = selections[1]
+    labels = 'callback="update_filter_state"'
+    requests = get_metric(client, f'dashboard_callback_seconds_count{{{labels}}}')
+
+    post_filter_state(app, client, selection['selected_composers'], selection['selected_ensembles'])
+
+    assert get_metric(client, f'dashboard_callback_seconds_count{{{labels}}}') == requests + 1
+    assert get_metric(client, f'dashboard_callback_stage_seconds_count{{{labels},stage="filter"}}') == requests + 1
+    assert get_metric(client, f'dashboard_callback_response_bytes_count{{{labels}}}') == requests + 1
+
+def test_callback_filter_values(app):
+    client = app.app.server.test_client()
+    composers = app.whole_data_set['composer'].unique().tolist()[:2]
+    ensembles = app.whole_data_set['ensemble'].unique().tolist()[:3]
+    labels = 'callback="update_filter_state"'
+    composer_sample = f'dashboard_callback_filter_values_bucket{{{labels},filter="composer",le="2"}}'
+    ensemble_sample = f'dashboard_callback_filter_values_bucket{{{labels},filter="ensemble",le="2"}}'
+    instrument_sample = f'dashboard_callback_filter_values_bucket{{{labels},filter="instrument_name",le="0"}}'
+    before = [get_metric(client, sample) for sample in [composer_sample, ensemble_sample, instrument_sample]]
+
+    post_filter_state(app, client, composers, ensembles)
+
+    # Two composers fall in the le="2" bucket, three ensembles do not, no instruments in le="0"
+    after = [get_metric(client, sample) for sample in [composer_sample, ensemble_sample, instrument_sample]]
+    assert [after_count - before_count for before_count, after_count in zip(before, after)] == [1, 0, 1]
+
+def test_callback_log_line(app, monkeypatch, capsys):
+    monkeypatch.setattr(app, 'callback_log_enabled', True)
+    composers = app.whole_data_set['composer'].unique().tolist()[:2]
+
+    post_filter_state(app, app.app.server.test_client(), composers, None)
+
+    log_line = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+    assert log_line['callback'] == 'update_filter_state'
+    assert log_line['filter_values'] == {'composer': 2, 'piece_composer': 0, 'piece_movement': 0, 'ensemble': 0,
+                                         'instrument_name': 0, 'key_quality': 0}
+
+def test_callback_metrics_label_unknown_outputs(app):
+    client = app.app.server.test_client()
+
+    client.post(callback_endpoint, json={'output': 'no-such-output.children', 'inputs': []})
+
+    metrics = client.get('/metrics').get_data(as_text=True)
+    assert 'no-such-output' not in metrics
+    assert 'dashboard_callback_seconds_count{callback="unknown"}' in metrics
+
+def test_metrics_report_cache_and_memory(app):
+    metrics = app.app.server.test_client().get('/metrics').get_data(as_text=True)
+
+    for structure in app.memory_report:
+        assert f'dashboard_memory_bytes{{structure="{structure}"}} {app.memory_report[structure]}' in metrics
+    assert 'dashboard_filter_cache_hits_total' in metrics
@@ -0,0 +1,15 @@
+# Movement partitions: each movement is one contiguous block of rows, in melodic index order
+
+import numpy as np
+
+
+def test_movement_partitions_cover_each_movement(app):
+    data = app.whole_data_set
+    movement_ids = data['id'].to_numpy()
+
+    assert sorted(app.movement_partitions) == sorted(data['id'].unique().tolist())
+    assert sum(stop - start for start, stop in app.movement_partitions.values()) == len(data)
+
+    for movement_id, (start, stop) in app.movement_partitions.items():
+        np.testing.assert_array_equal(np.flatnonzero(movement_ids == movement_id), np.arange(start, stop))
+        assert (np.diff(data['melodic_index'].to_numpy()[start:stop]) >= 0).all()
@@ -0,0 +1,50 @@
+# Request profiler: only requests sent with the profile token are profiled, and a profile that cannot be written
+# never costs the callback its response
+
+import os
+
+import pytest
+from dash_requests import callback_endpoint, find_callback, build_callback_request
+
+
+@pytest.fixture
+def profiled_app(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'profile_token', 'secret')
+    monkeypatch.setattr(app, 'profile_callbacks', set())
+    monkeypatch.setattr(app, 'profile_dir', str(tmp_path / 'profiles'))
+    return app
+
+def post_filter_state(app, headers):
+    output_key = find_callback(app.app.callback_map, 'filter-state-store.data')
+    body = build_callback_request(app.app.callback_map, output_key, {'composer-dropdown.value': ['Bach']})
+    return app.app.server.test_client().post(callback_endpoint, json=body, headers=headers)
+
+@pytest.mark.parametrize('headers', [{}, {'X-Profile-Token': 'wrong'}, {'X-Profile-Token': ''}])
+def test_requests_without_the_token_are_not_profiled(profiled_app, headers):
+    response = post_filter_state(profiled_app, headers)
+
+    assert response.status_code == 200
+    assert 'X-Profile-File' not in response.headers
+    assert not os.path.exists(profiled_app.profile_dir)
+
+def test_requests_with_the_token_are_profiled(profiled_app):
+    response = post_filter_state(profiled_app, {'X-Profile-Token': 'secret'})
+
+    profile_path = response.headers['X-Profile-File']
+    assert response.status_code == 200
+    assert os.path.dirname(profile_path) == profiled_app.profile_dir
+    assert os.path.basename(profile_path).startswith('update_filter_state-')
+    assert os.path.exists(profile_path) and os.path.exists(profile_path.replace('.pstats', '.txt'))
+    assert not profiled_app.profiler_lock.locked()
+
+def test_unwritable_profile_keeps_the_response(profiled_app, monkeypatch, tmp_path, capsys):
+    (tmp_path / 'file').write_text('')
+    monkeypatch.setattr(profiled_app, 'profile_dir', str(tmp_path / 'file' / 'profiles'))
+
+    response = post_filter_state(profiled_app, {'X-Profile-Token': 'secret'})
+
+    assert response.status_code == 200
+    assert response.get_json()['response']['filter-state-store']['data']['selections'][0] == ['Bach']
+    assert 'X-Profile-File' not in response.headers
+    assert 'Could not write the profile of update_filter_state' in capsys.readouterr().err
+    assert not profiled_app.profiler_lock.locked()
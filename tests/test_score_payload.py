@@ -0,0 +1,42 @@
+# Individual Score Analysis payload: the filtered notes of the selected movements grouped by melodic index, against
+# the same notes selected and sorted with pandas
+
+import numpy as np
+import pandas as pd
+
+
+def get_expected_notes(app, movement_ids, mask):
+    data = app.whole_data_set
+    notes = [data[mask & (data['id'] == movement_id).to_numpy()] for movement_id in movement_ids]
+    return pd.concat(notes).sort_values('melodic_index', kind='stable')
+
+def check_score_payload(app, selection, mask):
+    movement_ids = app.get_movement_ids(selection['selected_piece_movement_pairs'])
+    score = app.build_score_payload(movement_ids, app.filter_rows(**selection))
+    notes = get_expected_notes(app, movement_ids, mask)
+
+    assert score['melodic_indexes'] == sorted(notes['melodic_index'].unique().tolist())
+    assert score['note_offsets'][-1] == len(notes)
+    np.testing.assert_array_equal(np.repeat(score['melodic_indexes'], np.diff(score['note_offsets'])), notes['melodic_index'])
+
+    for column, labels_key, payload_key in [('instrument_name', 'instrument_labels', 'instruments'),
+                                            ('note_interval', 'interval_labels', 'intervals'),
+                                            ('note_name', 'note_name_labels', 'note_names')]:
+        np.testing.assert_array_equal(np.asarray(score[labels_key])[score[payload_key]], notes[column].astype(str), err_msg=column)
+
+def test_score_payload_of_one_movement(app):
+    data = app.whole_data_set
+    movement = data['piece_movement'].iat[0]
+    selection = {'selected_piece_movement_pairs': [movement],
+                 'selected_instruments': data['instrument_name'].value_counts().index[:2].tolist()}
+
+    check_score_payload(app, selection, (data['piece_movement'] == movement).to_numpy()
+                        & data['instrument_name'].isin(selection['selected_instruments']).to_numpy())
+
+def test_score_payload_merges_movements_by_melodic_index(app, selections):
+    selection, mask = selections[3]
+    check_score_payload(app, selection, mask)
+
+def test_score_payload_without_notes(app):
+    score = app.build_score_payload([-1], app.empty_rows)
+    assert score['melodic_indexes'] == [] and score['note_offsets'] == [0]
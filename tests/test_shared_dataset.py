@@ -0,0 +1,45 @@
+# Shared dataset: the note table and filter index written as .npy files and mapped back read-only
+
+import numpy as np
+import pandas as pd
+
+
+def test_shared_dataset_round_trip(app, tmp_path):
+    shared_dataset_path = str(tmp_path / 'whole_data_set-fingerprint-v1.shared')
+    app.write_shared_dataset(shared_dataset_path, app.whole_data_set, app.filter_index)
+
+    data, filter_index = app.read_shared_dataset(shared_dataset_path)
+
+    assert list(data.columns) == list(app.whole_data_set.columns)
+    for column in data.columns:
+        assert data[column].dtype == app.whole_data_set[column].dtype, column
+        if isinstance(data[column].dtype, pd.CategoricalDtype):
+            np.testing.assert_array_equal(data[column].array.codes, app.whole_data_set[column].array.codes, err_msg=column)
+        else:
+            np.testing.assert_array_equal(data[column].to_numpy(), app.whole_data_set[column].to_numpy(), err_msg=column)
+
+    assert filter_index.keys() == app.filter_index.keys()
+    for column, rows_by_value in app.filter_index.items():
+        assert list(filter_index[column]) == list(rows_by_value)
+        for value, rows in rows_by_value.items():
+            np.testing.assert_array_equal(filter_index[column][value], rows, err_msg=f'{column}: {value}')
+
+def is_memory_mapped(array):
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+def test_shared_dataset_is_memory_mapped_read_only(app, tmp_path):
+    shared_dataset_path = str(tmp_path / 'whole_data_set-fingerprint-v1.shared')
+    app.write_shared_dataset(shared_dataset_path, app.whole_data_set, app.filter_index)
+
+    data, filter_index = app.read_shared_dataset(shared_dataset_path)
+
+    for column_array in [data['melodic_index'].to_numpy(), data['composer'].array.codes, filter_index['composer'][data['composer'].iat[0]]]:
+        assert is_memory_mapped(column_array)
+        assert not column_array.flags.writeable
+
+def test_shared_dataset_not_written(app, tmp_path):
+    assert app.read_shared_dataset(str(tmp_path / 'missing.shared')) is None
@@ -0,0 +1,7 @@
+# WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:server
+# Importing app loads the dataset and builds the figures, so with preload_app this runs once
+# in the master process and the forked workers share those pages copy-on-write
+
+from app import app
+
+server = app.server